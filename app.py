@@ -2,11 +2,12 @@
 # -*- coding: utf-8 -*-
 # 🤖 VideoRobot Streamlit UI — stable imports, backend-first, robust render paths.
 
+import functools
 import os
 import sys
 import shutil
-import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 import inspect as _inspect
 import streamlit as st
 
@@ -16,6 +17,16 @@ if str(PKG_PARENT) not in sys.path:
     sys.path.insert(0, str(PKG_PARENT))
 os.environ["PYTHONPATH"] = f"{PKG_PARENT}:{os.environ.get('PYTHONPATH','')}"
 
+# ---------- Logging (backend no longer configures it on import) ----------
+# Idempotent, so Streamlit's re-runs of this script add no handlers.
+try:
+    from videorobot.backend.utils import setup_logging as _setup_logging
+except Exception:  # legacy checkouts without backend/utils.py
+    import logging
+    logging.basicConfig(level=logging.INFO)
+else:
+    _setup_logging()
+
 # ---------- Constants & Paths ----------
 REPO_DIR    = Path("/content/videorobot")
 DRIVE_BASE  = Path("/content/drive/MyDrive/VideoRobot")
@@ -23,74 +34,87 @@ ASSETS_DIR  = DRIVE_BASE / "Assets"
 OUTPUT_DIR  = DRIVE_BASE / "Output"
 REPO_ASSETS = REPO_DIR / "Assets"
 
-for p in [ASSETS_DIR, OUTPUT_DIR]:
-    p.mkdir(parents=True, exist_ok=True)
+@st.cache_resource(show_spinner=False)
+def _init_paths() -> bool:
+    """Create Drive dirs + Assets symlink once per process (each stat on Drive FUSE is an RPC)."""
+    for p in [ASSETS_DIR, OUTPUT_DIR]:
+        try:
+            os.lstat(p)
+        except FileNotFoundError:
+            p.mkdir(parents=True, exist_ok=True)
 
-# Prefer Drive assets via symlink if repo lacks Assets
-try:
-    if not REPO_ASSETS.exists():
-        os.symlink(str(ASSETS_DIR), str(REPO_ASSETS))
-except FileExistsError:
-    pass
-except Exception:
-    pass
+    # Prefer Drive assets via symlink if repo lacks Assets
+    try:
+        os.lstat(REPO_ASSETS)
+    except FileNotFoundError:
+        try:
+            os.symlink(str(ASSETS_DIR), str(REPO_ASSETS))
+        except Exception:
+            pass
+    except Exception:
+        pass
+    return True
+
+_init_paths()
 
 # ---------- Import backend (explicit-first, robust-fallback) ----------
-Renderer = None
-ProjectCfg = AudioCfg = CaptionCfg = VisualCfg = Aspect = CaptionPosition = ShortsCfg = None
-Paths = IntroOutroCfg = CTACfg = BGMCfg = FigureCfg = BrollCfg = ShortsMode = None
-
-_backend_error = None
+_CFG_NAMES = (
+    "ProjectCfg", "AudioCfg", "CaptionCfg", "VisualCfg", "Aspect", "CaptionPosition", "ShortsCfg",
+    "Paths", "IntroOutroCfg", "CTACfg", "BGMCfg", "FigureCfg", "BrollCfg", "ShortsMode",
+)
 
-def _import_backend():
-    """Prefer videorobot.backend.*, fallback to videorobot.* legacy."""
-    global Renderer, ProjectCfg, AudioCfg, CaptionCfg, VisualCfg, Aspect, CaptionPosition, ShortsCfg
-    global Paths, IntroOutroCfg, CTACfg, BGMCfg, FigureCfg, BrollCfg, ShortsMode, _backend_error
+@st.cache_resource(show_spinner=False)
+def _load_backend():
+    """
+    Prefer videorobot.backend.*, fallback to videorobot.* legacy.
+    Cached per process: Streamlit re-executes this script on every widget change.
+    """
+    found = dict.fromkeys(("Renderer",) + _CFG_NAMES)
 
     # Attempt A: backend/*
     try:
         from videorobot.backend.renderer import Renderer as _R
-        from videorobot.backend.config import (
-            ProjectCfg as _PC, AudioCfg as _AC, CaptionCfg as _CC, VisualCfg as _VC,
-            Aspect as _ASP, CaptionPosition as _CP, ShortsCfg as _SC, Paths as _PTH,
-            IntroOutroCfg as _IOC, CTACfg as _CTC, BGMCfg as _BG, FigureCfg as _FGC,
-            BrollCfg as _BRC, ShortsMode as _SM
-        )
-        Renderer, ProjectCfg, AudioCfg, CaptionCfg, VisualCfg = _R, _PC, _AC, _CC, _VC
-        Aspect, CaptionPosition, ShortsCfg = _ASP, _CP, _SC
-        Paths, IntroOutroCfg, CTACfg, BGMCfg = _PTH, _IOC, _CTC, _BG
-        FigureCfg, BrollCfg, ShortsMode = _FGC, _BRC, _SM
-        return True
+        import videorobot.backend.config as _cfg
+        found.update({n: getattr(_cfg, n) for n in _CFG_NAMES}, Renderer=_R)
+        return SimpleNamespace(ok=True, error=None, **found)
     except Exception as e:
-        _backend_error = f"backend import failed: {e}"
+        error = f"backend import failed: {e}"
 
     # Attempt B: legacy root modules
     try:
         from videorobot.renderer import Renderer as _R
         import videorobot.config as _cfg
-        Renderer = _R
-        ProjectCfg        = getattr(_cfg, "ProjectCfg", None)
-        AudioCfg          = getattr(_cfg, "AudioCfg", None)
-        CaptionCfg        = getattr(_cfg, "CaptionCfg", None)
-        VisualCfg         = getattr(_cfg, "VisualCfg", None)
-        Aspect            = getattr(_cfg, "Aspect", None)
-        CaptionPosition   = getattr(_cfg, "CaptionPosition", None)
-        ShortsCfg         = getattr(_cfg, "ShortsCfg", None)
-        Paths             = getattr(_cfg, "Paths", None)
-        IntroOutroCfg     = getattr(_cfg, "IntroOutroCfg", None)
-        CTACfg            = getattr(_cfg, "CTACfg", None)
-        BGMCfg            = getattr(_cfg, "BGMCfg", None)
-        FigureCfg         = getattr(_cfg, "FigureCfg", None)
-        BrollCfg          = getattr(_cfg, "BrollCfg", None)
-        ShortsMode        = getattr(_cfg, "ShortsMode", None)
-        return any([Renderer, ProjectCfg, AudioCfg, CaptionCfg, VisualCfg])
+        found.update({n: getattr(_cfg, n, None) for n in _CFG_NAMES}, Renderer=_R)
+        ok = any(found[n] for n in ("Renderer", "ProjectCfg", "AudioCfg", "CaptionCfg", "VisualCfg"))
+        return SimpleNamespace(ok=ok, error=error, **found)
     except Exception as e:
-        _backend_error = f"{_backend_error or ''} | root import failed: {e}"
-        return False
-
-_import_ok = _import_backend()
+        return SimpleNamespace(ok=False, error=f"{error} | root import failed: {e}", **found)
+
+_bk = _load_backend()
+Renderer        = _bk.Renderer
+ProjectCfg      = _bk.ProjectCfg
+AudioCfg        = _bk.AudioCfg
+CaptionCfg      = _bk.CaptionCfg
+VisualCfg       = _bk.VisualCfg
+Aspect          = _bk.Aspect
+CaptionPosition = _bk.CaptionPosition
+ShortsCfg       = _bk.ShortsCfg
+Paths           = _bk.Paths
+IntroOutroCfg   = _bk.IntroOutroCfg
+CTACfg          = _bk.CTACfg
+BGMCfg          = _bk.BGMCfg
+FigureCfg       = _bk.FigureCfg
+BrollCfg        = _bk.BrollCfg
+ShortsMode      = _bk.ShortsMode
+_import_ok      = _bk.ok
+_backend_error  = _bk.error
 
 # ---------- CaptionCfg compatibility shim ----------
+@functools.lru_cache(maxsize=None)
+def _allowed_params(cls) -> frozenset:
+    """Constructor parameter names of a config class (signature is fixed after import)."""
+    return frozenset(_inspect.signature(cls).parameters)
+
 def make_caption_cfg(**kw):
     """
     Harmonize CaptionCfg args across versions:
@@ -100,8 +124,7 @@ def make_caption_cfg(**kw):
     if CaptionCfg is None:
         raise RuntimeError("CaptionCfg not available in backend.")
 
-    sig = _inspect.signature(CaptionCfg)
-    allowed = set(sig.parameters.keys())
+    allowed = _allowed_params(CaptionCfg)
 
     # font normalization
     fname = kw.pop("font_name", None)
@@ -131,8 +154,7 @@ def make_figure_cfg(**kw):
     if FigureCfg is None:
         return None  # If project allows figures=None, that's fine
 
-    sig = _inspect.signature(FigureCfg)
-    allowed = set(sig.parameters.keys())
+    allowed = _allowed_params(FigureCfg)
 
     defaults = dict(
         use=False,
@@ -160,56 +182,123 @@ if not _import_ok or not all([Renderer, ProjectCfg, AudioCfg, CaptionCfg, Visual
         "• videorobot/backend/renderer.py\n"
         f"جزئیات: {_backend_error or 'N/A'}"
     )
+    _load_backend.clear()  # retry the import on the next rerun
     st.stop()
 
 # ---------- Sidebar: pick assets from Google Drive ----------
+# Drive is FUSE-mounted (every stat is an RPC) and Streamlit reruns the whole
+# script on each widget change, so directory listings are cached briefly.
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def scan_assets_once(dir_path: str) -> dict[str, list[str]]:
+    """One scandir per directory; file names bucketed by lower-case extension."""
+    buckets: dict[str, list[str]] = {}
+    try:
+        with os.scandir(dir_path) as it:
+            for e in it:
+                ext = os.path.splitext(e.name)[1].lower()
+                # DirEntry carries the file type from readdir: no per-entry stat
+                if ext and e.is_file():
+                    buckets.setdefault(ext, []).append(e.name)
+    except OSError:
+        return {}
+    for names in buckets.values():
+        names.sort()
+    return buckets
+
+def list_files(dir_path: str, exts: tuple[str, ...]) -> tuple[str, ...]:
+    buckets = scan_assets_once(dir_path)
+    return tuple(sorted(name for ext in exts for name in buckets.get(ext, ())))
+
+AUDIO_EXTS = (".m4a", ".mp3", ".wav")
+IMAGE_EXTS = (".jpeg", ".jpg", ".png")
+FONT_EXTS  = (".otf", ".ttf")
+VIDEO_EXTS = (".mov", ".mp4")
+
 with st.sidebar:
     st.header("📁 فایل‌ها از Google Drive")
+    if st.button("🔄 بازخوانی"):
+        scan_assets_once.clear()
 
-    def list_files(dir_path: Path, exts: set[str]):
-        if not dir_path.exists():
-            return []
-        return [f.name for f in sorted(dir_path.glob("*")) if f.is_file() and f.suffix.lower() in exts]
-
-    audio_files = list_files(ASSETS_DIR, {".mp3", ".wav", ".m4a"})
-    image_files = list_files(ASSETS_DIR, {".jpg", ".jpeg", ".png"})
-    font_files  = list_files(ASSETS_DIR / "Fonts", {".ttf", ".otf"})
-    intro_files = list_files(ASSETS_DIR / "Intro", {".mp4", ".mov"})
-    outro_files = list_files(ASSETS_DIR / "Outro", {".mp4", ".mov"})
-    cta_files   = list_files(ASSETS_DIR / "CTA", {".mp4", ".mov"})
-    bgm_files   = list_files(ASSETS_DIR / "Music", {".mp3", ".wav", ".m4a"})
-
-    audio_file = st.selectbox("🎧 فایل صوتی", options=audio_files or ["(هیچی نیست)"])
-    bg_image   = st.selectbox("🖼️ تصویر پس‌زمینه", options=image_files or ["(هیچی نیست)"])
-    font_file  = st.selectbox("🔤 فونت (اختیاری)", options=["(پیش‌فرض)"] + font_files)
-    intro_file = st.selectbox("🎬 Intro", options=["(ندارم)"] + intro_files)
-    outro_file = st.selectbox("🏁 Outro", options=["(ندارم)"] + outro_files)
-    cta_file   = st.selectbox("🔁 CTA Loop", options=["(ندارم)"] + cta_files)
-    bgm_file   = st.selectbox("🎵 موسیقی پس‌زمینه", options=["(ندارم)"] + bgm_files)
+    audio_files = list_files(str(ASSETS_DIR), AUDIO_EXTS)
+    image_files = list_files(str(ASSETS_DIR), IMAGE_EXTS)
+    font_files  = list_files(str(ASSETS_DIR / "Fonts"), FONT_EXTS)
+    intro_files = list_files(str(ASSETS_DIR / "Intro"), VIDEO_EXTS)
+    outro_files = list_files(str(ASSETS_DIR / "Outro"), VIDEO_EXTS)
+    cta_files   = list_files(str(ASSETS_DIR / "CTA"), VIDEO_EXTS)
+    bgm_files   = list_files(str(ASSETS_DIR / "Music"), AUDIO_EXTS)
 
 # ---------- Controls ----------
-st.header("⚙️ تنظیمات")
-col1, col2 = st.columns(2)
-with col1:
-    aspect_ratio  = st.selectbox("نسبت تصویر", ['9:16', '1:1', '16:9'], index=0)
-    ken_burns     = st.checkbox("افکت زوم (Ken Burns)", value=True)
-    font_size     = st.slider("اندازه فونت", 30, 150, 92)
-    whisper_model = st.selectbox("مدل Whisper", ['tiny', 'base', 'small', 'medium', 'large'], index=2)
-with col2:
-    active_color  = st.color_picker("رنگ اصلی زیرنویس", "#FFFFFF")
-    keyword_color = st.color_picker("رنگ کلمات کلیدی", "#FFD700")
-    caption_pos   = st.selectbox("موقعیت زیرنویس", ['BOTTOM', 'MIDDLE', 'TOP'], index=0)
-    use_vad       = st.checkbox("Voice Activity Detection", value=True)
+# همهٔ انتخاب‌ها داخل یک فرم: Streamlit فقط هنگام submit اسکریپت را دوباره اجرا می‌کند،
+# نه با هر تغییر ویجت. (فرم نمی‌تواند بین sidebar و بدنه پخش شود.)
+with st.form("render_form"):
+    st.subheader("📁 فایل‌ها")
+    fcol1, fcol2 = st.columns(2)
+    with fcol1:
+        audio_file = st.selectbox("🎧 فایل صوتی", options=audio_files or ("(هیچی نیست)",))
+        bg_image   = st.selectbox("🖼️ تصویر پس‌زمینه", options=image_files or ("(هیچی نیست)",))
+        font_file  = st.selectbox("🔤 فونت (اختیاری)", options=("(پیش‌فرض)", *font_files))
+        bgm_file   = st.selectbox("🎵 موسیقی پس‌زمینه", options=("(ندارم)", *bgm_files))
+    with fcol2:
+        intro_file = st.selectbox("🎬 Intro", options=("(ندارم)", *intro_files))
+        outro_file = st.selectbox("🏁 Outro", options=("(ندارم)", *outro_files))
+        cta_file   = st.selectbox("🔁 CTA Loop", options=("(ندارم)", *cta_files))
+
+    st.header("⚙️ تنظیمات")
+    col1, col2 = st.columns(2)
+    with col1:
+        aspect_ratio  = st.selectbox("نسبت تصویر", ('9:16', '1:1', '16:9'), index=0)
+        ken_burns     = st.checkbox("افکت زوم (Ken Burns)", value=True)
+        font_size     = st.slider("اندازه فونت", 30, 150, 92)
+        whisper_model = st.selectbox("مدل Whisper", ('tiny', 'base', 'small', 'medium', 'large'), index=2)
+    with col2:
+        active_color  = st.color_picker("رنگ اصلی زیرنویس", "#FFFFFF")
+        keyword_color = st.color_picker("رنگ کلمات کلیدی", "#FFD700")
+        caption_pos   = st.selectbox("موقعیت زیرنویس", ('BOTTOM', 'MIDDLE', 'TOP'), index=0)
+        use_vad       = st.checkbox("Voice Activity Detection", value=True)
+
+    submitted = st.form_submit_button("🎬 شروع رندر", type="primary", use_container_width=True)
+
+# lookup tables are built once per script run, not on every call
+_ASPECT_MAP = (
+    {'9:16': Aspect.V9x16, '1:1': Aspect.V1x1, '16:9': Aspect.V16x9}
+    if Aspect is not None else {}
+)
+_CAPPOS_MAP = (
+    {'TOP': CaptionPosition.TOP, 'MIDDLE': CaptionPosition.MIDDLE, 'BOTTOM': CaptionPosition.BOTTOM}
+    if CaptionPosition is not None else {}
+)
 
 def _aspect(val):
-    if Aspect is None:
+    if not _ASPECT_MAP:
         return None
-    return {'9:16': Aspect.V9x16, '1:1': Aspect.V1x1, '16:9': Aspect.V16x9}.get(val, Aspect.V9x16)
+    return _ASPECT_MAP.get(val, _ASPECT_MAP['9:16'])
 
 def _cap_pos(val):
-    if CaptionPosition is None:
+    if not _CAPPOS_MAP:
         return None
-    return {'TOP': CaptionPosition.TOP, 'MIDDLE': CaptionPosition.MIDDLE, 'BOTTOM': CaptionPosition.BOTTOM}.get(val, CaptionPosition.BOTTOM)
+    return _CAPPOS_MAP.get(val, _CAPPOS_MAP['BOTTOM'])
+
+def _new_renderer():
+    """
+    A fresh Renderer per render: it keeps per-render state (work dir, manifest,
+    last result), so sharing one across Streamlit sessions would mix them up.
+    Whisper weights are already shared process-wide by Scheduler's model cache.
+    """
+    paths = Paths(
+        base_local=REPO_DIR,
+        base_drive=DRIVE_BASE,
+        tmp=REPO_DIR / "_vr_tmp",
+        out_local=REPO_DIR / "_vr_out",
+        out_drive=OUTPUT_DIR,
+        assets=ASSETS_DIR,
+        figures=ASSETS_DIR / "Figures",
+        music=ASSETS_DIR / "Music",
+        broll=DRIVE_BASE / "Broll",
+    )
+    if hasattr(paths, "ensure_dirs"):
+        paths.ensure_dirs()
+
+    return Renderer(paths)  # Renderer.__init__(paths) -> None
 
 # ---------- Render Action ----------
 def run_render():
@@ -244,21 +333,7 @@ def run_render():
             shorts=ShortsCfg(mode=ShortsMode.AUTO) if ShortsCfg and ShortsMode else None,
         )
 
-        paths = Paths(
-            base_local=REPO_DIR,
-            base_drive=DRIVE_BASE,
-            tmp=REPO_DIR / "_vr_tmp",
-            out_local=REPO_DIR / "_vr_out",
-            out_drive=OUTPUT_DIR,
-            assets=ASSETS_DIR,
-            figures=ASSETS_DIR / "Figures",
-            music=ASSETS_DIR / "Music",
-            broll=DRIVE_BASE / "Broll",
-        )
-        if hasattr(paths, "ensure_dirs"):
-            paths.ensure_dirs()
-
-        renderer = Renderer(paths)  # Renderer.__init__(paths) -> None
+        renderer = _new_renderer()
 
         with st.spinner("در حال رندر..."):
             out = renderer.render(config)
@@ -275,7 +350,9 @@ def run_render():
             output_video = Path(output_video)
             final_path = OUTPUT_DIR / output_video.name
             try:
-                shutil.copy2(output_video, final_path)
+                if output_video.resolve() != final_path.resolve():
+                    # کپی، نه جابه‌جایی: work dir، manifest و inputs hash رندرر هنوز به فایل محلی _vr_out اشاره می‌کنند
+                    shutil.copy2(output_video, final_path)
             except Exception:
                 # if already placed in OUTPUT_DIR
                 final_path = output_video if output_video.exists() else final_path
@@ -286,5 +363,5 @@ def run_render():
     except Exception as e:
         st.error(f"❌ خطا هنگام رندر: {e}")
 
-if st.button("🎬 شروع رندر", type="primary", use_container_width=True):
+if submitted:
     run_render()
@@ -3,99 +3,187 @@
 VideoRobot — backend package initializer (clean & robust)
 
 - No nested "backend.backend" imports.
-- Strictly relative imports inside the backend package.
+- Public symbols are resolved lazily (PEP 562) on first attribute access.
 - Optional compatibility shim for CaptionCfg.
-- Logging bootstrap via utils.setup_logging with safe fallback.
+- No logging side effects on import; call setup_logging() to enable output.
 """
 
 from __future__ import annotations
 
+import functools
+import importlib
 import logging
-import os
-from importlib import metadata
-from typing import Iterable
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - resolved by IDEs / type checkers only
+    from types import ModuleType
+    from typing import Any
+
+    from .audio_processor import AudioProcessor
+    from .config import (
+        FONTS,
+        Aspect,
+        AudioCfg,
+        BGMCfg,
+        BrollCfg,
+        CaptionCfg,
+        CaptionPosition,
+        CTACfg,
+        FigureCfg,
+        IntroOutroCfg,
+        Paths,
+        ProjectCfg,
+        ShortsCfg,
+        ShortsMode,
+        VisualCfg,
+    )
+    from .renderer import Renderer
+    from .scheduler import Scheduler
+    from .subtitles import SubtitleWriter
+    from .utils import (
+        build_fonts_only,
+        docs_guard,
+        ensure_pkg_safe,
+        hex_to_0xRRGGBB,
+        hhmmss_cs,
+        mount_drive_once,
+        pick_default_font_name,
+        resolve_drive_base,
+        sanitize_filename,
+        setup_logging,
+        sh,
+        srt_time,
+        sync_from_drive_to_local,
+    )
 
 
 # ---------------------------------------------------------------------------
 # Version (best-effort; fine if it falls back when running from source)
+# Resolved lazily: `__version__` is served by __getattr__ on first access.
 # ---------------------------------------------------------------------------
 def _detect_version(pkg: str = "videorobot", fallback: str = "0.0.0") -> str:
+    # importlib.metadata is costly to import; only pay for it when asked
+    from importlib import metadata
+
     try:
         return metadata.version(pkg)
     except Exception:
         return fallback
 
 
-__version__ = _detect_version()
-
-
 # ---------------------------------------------------------------------------
-# Public surface (filled by imports below)
+# Public surface (materialized lazily by __getattr__ below)
 # ---------------------------------------------------------------------------
-__all__ = [
-    # Config layer
+_CONFIG_SYMS = (
     "Paths", "ProjectCfg", "AudioCfg", "CaptionCfg", "FigureCfg",
     "IntroOutroCfg", "CTACfg", "BGMCfg", "BrollCfg", "VisualCfg",
     "ShortsCfg", "Aspect", "CaptionPosition", "ShortsMode", "FONTS",
-    # Core classes
-    "Renderer", "Scheduler", "SubtitleWriter", "AudioProcessor",
-    # Utilities
+)
+_CORE_SYMS = {
+    "Renderer": "renderer",
+    "Scheduler": "scheduler",
+    "SubtitleWriter": "subtitles",
+    "AudioProcessor": "audio_processor",
+}
+_UTIL_SYMS = (
     "sh", "setup_logging", "sanitize_filename", "hex_to_0xRRGGBB",
     "srt_time", "hhmmss_cs", "build_fonts_only", "pick_default_font_name",
     "mount_drive_once", "resolve_drive_base", "sync_from_drive_to_local",
     "ensure_pkg_safe", "docs_guard",
+)
+
+__all__ = (
+    *_CONFIG_SYMS,
+    *_CORE_SYMS,
+    *_UTIL_SYMS,
     # Vars/helpers
     "__version__", "make_caption_cfg_compat",
-]
+)
 
 
 # ---------------------------------------------------------------------------
-# Strict relative imports (this package lives at videorobot/backend/)
+# Lazy imports (PEP 562): symbol -> (submodule, attribute)
 # ---------------------------------------------------------------------------
-# Configs
-from .config import (  # noqa: E402
-    Paths, ProjectCfg, AudioCfg, CaptionCfg, FigureCfg, IntroOutroCfg,
-    CTACfg, BGMCfg, BrollCfg, VisualCfg, ShortsCfg,
-    Aspect, CaptionPosition, ShortsMode, FONTS,
+_LAZY: dict[str, tuple[str, str]] = (
+    {s: ("config", s) for s in _CONFIG_SYMS}
+    | {s: (mod, s) for s, mod in _CORE_SYMS.items()}
+    | {s: ("utils", s) for s in _UTIL_SYMS}
 )
 
-# Core components
-from .renderer import Renderer  # noqa: E402
-from .scheduler import Scheduler  # noqa: E402
-from .subtitles import SubtitleWriter  # noqa: E402
-from .audio_processor import AudioProcessor  # noqa: E402
-
-# Utilities
-from .utils import (  # noqa: E402
-    sh, setup_logging, sanitize_filename, hex_to_0xRRGGBB,
-    srt_time, hhmmss_cs, build_fonts_only, pick_default_font_name,
-    mount_drive_once, resolve_drive_base, sync_from_drive_to_local,
-    ensure_pkg_safe, docs_guard,
-)
+# Package that actually hosts the submodules: this package (videorobot/backend/)
+# or, for legacy checkouts, its parent (videorobot/). Probed once, on first use.
+_BASE: str | None = None
 
 
-# ---------------------------------------------------------------------------
-# Logging bootstrap
-# ---------------------------------------------------------------------------
-def _bootstrap_logger() -> logging.Logger:
+def _select_base() -> str:
+    """Locate the package holding `config` once, without executing it."""
+    global _BASE
+    if _BASE is None:
+        import importlib.util
+
+        parent = __name__.rpartition(".")[0]
+        _BASE = __name__
+        if parent and importlib.util.find_spec(f"{__name__}.config") is None:
+            try:
+                if importlib.util.find_spec(f"{parent}.config") is not None:
+                    _BASE = parent
+            except ModuleNotFoundError:
+                pass
+    return _BASE
+
+
+def _import_submodule(mod: str) -> ModuleType:
+    return importlib.import_module(f"{_select_base()}.{mod}")
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value = _detect_version()
+        globals()[name] = value
+        return value
+
     try:
-        level = os.getenv("VIDEO_ROBOT_LOG_LEVEL", "INFO")
-        return setup_logging(level=level)
-    except Exception:
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        )
-        return logging.getLogger("VideoRobot")
+        mod, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(_import_submodule(mod), attr)
+    globals()[name] = value
+    return value
 
 
-log = _bootstrap_logger()
-log.debug("videorobot.backend imported (version=%s)", __version__)
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+# ---------------------------------------------------------------------------
+# Logging: quiet by default (library-friendly). Applications that want
+# console output must call `setup_logging()` explicitly.
+# ---------------------------------------------------------------------------
+_LOGGER_NAME = "VideoRobot"
+
+log = logging.getLogger(_LOGGER_NAME)
+log.addHandler(logging.NullHandler())
 
 
 # ---------------------------------------------------------------------------
 # Optional compatibility shim for CaptionCfg
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def _caption_cfg_params() -> frozenset[str]:
+    """Constructor parameter names of CaptionCfg (computed once)."""
+    import dataclasses
+
+    cls = __getattr__("CaptionCfg")
+    if dataclasses.is_dataclass(cls):
+        return frozenset(f.name for f in dataclasses.fields(cls) if f.init)
+
+    import inspect
+
+    return frozenset(inspect.signature(cls).parameters)
+
+
 def make_caption_cfg_compat(**kwargs) -> CaptionCfg:
     """
     Build a CaptionCfg while tolerating older/newer signatures.
@@ -103,10 +191,8 @@ def make_caption_cfg_compat(**kwargs) -> CaptionCfg:
     - Accepts either font_name or font_choice and maps appropriately.
     - Fills safe defaults for newer params when present.
     """
-    import inspect
-
-    sig = inspect.signature(CaptionCfg)
-    allowed = set(sig.parameters.keys())
+    CaptionCfg = __getattr__("CaptionCfg")  # noqa: N806 - lazily resolved class
+    allowed = _caption_cfg_params()
 
     # unify font args
     fname = kwargs.pop("font_name", None)
@@ -137,7 +223,11 @@ def make_caption_cfg_compat(**kwargs) -> CaptionCfg:
 # ---------------------------------------------------------------------------
 # Guard utility for library users/tests
 # ---------------------------------------------------------------------------
-def require_backend_modules(*modules: Iterable[str]) -> None:
+# Fully-qualified module names already verified importable (repeat calls are O(1))
+_VERIFIED: set[str] = set()
+
+
+def require_backend_modules(*modules: str) -> None:
     """
     Ensure local backend modules exist and are importable.
     Example: require_backend_modules("config", "renderer")
@@ -145,10 +235,16 @@ def require_backend_modules(*modules: Iterable[str]) -> None:
     miss = []
     base = __name__  # 'backend'
     for m in modules or ("config", "renderer"):
-        try:
-            __import__(f"{base}.{m}")
-        except Exception:
-            miss.append(m)
+        key = f"{base}.{m}"
+        if key in _VERIFIED:
+            continue
+        if key not in sys.modules:
+            try:
+                __import__(key)
+            except Exception:
+                miss.append(m)
+                continue
+        _VERIFIED.add(key)
     if miss:
         raise ImportError(
             "Missing required backend modules: "
@@ -3,40 +3,85 @@
 VideoRobot — Audio Processor (Clean & Complete Version)
 
 Professional audio processing with FFmpeg:
-1. Converts to stereo 48kHz
-2. Measures loudness per channel
-3. Applies per-channel gain
-4. Performs two-pass EBU R128 normalization
+1. Measures loudness per channel of the stereo 48kHz signal
+2. Applies stereo conversion + per-channel gain inside a two-pass EBU R128
+   normalization; no intermediate WAV is written
 
 References:
-- FFmpeg Filters: aformat, pan, channelsplit, volume, loudnorm
+- FFmpeg Filters: aformat, pan, asplit, ebur128, loudnorm
 - EBU R128 loudness standard
 - Two-pass loudnorm workflow
 """
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib
 import json
 import logging
 import math
+import multiprocessing
 import os
 import re
-from dataclasses import dataclass
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Tuple, Optional, Any, TypedDict
+from typing import Dict, List, Sequence, Tuple, Optional, Any, TypedDict
 from . import config
 
-from .utils import sh
+from .utils import sh, sh_stream
+
+# orjson (اختیاری) parses the small loudnorm dicts ~3x faster; its
+# JSONDecodeError subclasses ValueError, like json's.
+try:
+    import orjson as _json_fast
+    _loads = _json_fast.loads
+except ImportError:
+    _loads = json.loads
 
 log = logging.getLogger("VideoRobot.audio")
 
+# A JSON object opens with a key or closes at once; "{junk" in a log line does not
+_JSON_OBJECT_OPEN = re.compile(r'\{\s*["}]')
+
 
 # ===========================================================================
 # SECTION 1: Helper Functions
 # ===========================================================================
 
-# Pattern to extract JSON from stderr.
-# This non-recursive pattern is compatible with Python's re module and finds JSON objects, including nested ones.
-_JSON_PATTERN = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", re.DOTALL)
+def _json_object_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Matched ``{``/``}`` pairs of ``text`` in one forward pass, ordered by the
+    position of the closing brace.
+
+    Braces inside JSON strings (with backslash escapes) are ignored. JSON
+    strings cannot hold a raw newline, so string state resets at each line
+    end and a stray quote in a log line cannot swallow the rest of the text.
+    Unmatched braces on either side are skipped. O(len(text)).
+
+    Returns:
+        (start, end) index pairs, inclusive, with ``end`` ascending.
+    """
+    spans: List[Tuple[int, int]] = []
+    opens: List[int] = []
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"' or char == "\n":
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            opens.append(i)
+        elif char == "}" and opens:
+            spans.append((opens.pop(), i))
+    return spans
 
 
 def _extract_last_json(stderr_text: str) -> Dict[str, Any]:
@@ -44,7 +89,14 @@ def _extract_last_json(stderr_text: str) -> Dict[str, Any]:
     Extracts the last JSON block from stderr output.
 
     The loudnorm filter prints its stats in JSON format to stderr.
-    This function finds and parses the last valid JSON block.
+    Brace pairs come from one pass of ``_json_object_spans``; walking them
+    from the end, the outermost block of each nest is tried first and the
+    first one that parses to a dict is returned, so stray braces in later
+    log lines do not hide the stats. A ``{`` that cannot open an object
+    (``_JSON_OBJECT_OPEN``) is dropped without parsing, so an unmatched brace
+    in an earlier log line does not hide the block. A block that fails to
+    parse is skipped together with everything nested in it; the parsed
+    slices are disjoint, so the whole search stays O(len(stderr_text)).
 
     Args:
         stderr_text: The text from stderr.
@@ -54,19 +106,121 @@ def _extract_last_json(stderr_text: str) -> Dict[str, Any]:
     """
     if not stderr_text:
         return {}
+
+    limit = len(stderr_text)
+    for start, end in reversed(_json_object_spans(stderr_text)):
+        if end >= limit or not _JSON_OBJECT_OPEN.match(stderr_text, start):
+            # Nested inside a block already tried, or not an object opening
+            continue
+        try:
+            block = _loads(stderr_text[start:end + 1])
+        except (ValueError, RecursionError) as e:
+            log.debug("Skipping non-JSON brace block: %s", e)
+        else:
+            if isinstance(block, dict):
+                return block
+        limit = start
+
+    log.warning("Error parsing loudnorm JSON: no valid block in stderr")
+    return {}
+
+
+def _run_ffmpeg_capture_last_json(cmd: List[str], desc: str) -> Dict[str, Any]:
+    """
+    Runs ffmpeg and scans stderr line by line for JSON objects.
+
+    The scan runs as ``sh_stream``'s stderr consumer, so parsing overlaps
+    with ffmpeg's run. Only the JSON block being assembled, the last parsed
+    block and a short tail (for the failure log) are kept, so memory does
+    not grow with the length of stderr. A non-zero exit is logged, not
+    raised; the caller decides what an empty result means.
+
+    Args:
+        cmd: The ffmpeg command.
+        desc: Description for the log.
+
+    Returns:
+        The last JSON object printed, or an empty dict.
+    """
+    last: Dict[str, Any] = {}
+    block: List[bytes] = []
+    depth = 0
     
-    try:
-        last_match = None
-        for match in _JSON_PATTERN.finditer(stderr_text):
-            last_match = match.group(0)
-        
-        if not last_match:
-            return {}
-        
-        return json.loads(last_match)
-    except Exception as e:
-        log.warning("Error parsing loudnorm JSON: %s", e)
-        return {}
+    def consume(line: bytes) -> None:
+        nonlocal last, depth
+        if not depth:
+            pos = line.find(b"{")
+            if pos < 0:
+                return
+            line = line[pos:]
+        block.append(line)
+        # loudnorm's values are plain numbers-as-strings: no braces inside strings
+        depth += line.count(b"{") - line.count(b"}")
+        if depth <= 0 or len(block) > 256:
+            try:
+                parsed = _loads(b"".join(block))
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, dict):
+                last = parsed
+            block.clear()
+            depth = 0
+    
+    result = sh_stream(cmd, desc, check=False, tail_kb=4, stderr_consumer=consume)
+    if result.returncode != 0:
+        log.warning("%s exited with code %d: %s", desc, result.returncode, result.stderr.strip())
+    # Line-level brace counting can be fooled by odd output; rescan the tail properly
+    return last or _extract_last_json(result.stderr)
+
+
+def _split_by_filter(stderr_text: str, name: str) -> Dict[int, str]:
+    """
+    Groups stderr text by the ``[Parsed_<name>_N @ 0x...]`` instance that logged it.
+
+    N is the filter's position in the graph, so several instances of the same
+    filter in one ffmpeg run can be told apart (lower N = declared earlier).
+
+    Returns:
+        {N: concatenated text logged by that instance}
+    """
+    tag = re.compile(rf"\[Parsed_{re.escape(name)}_(\d+) @ [^\]]*\]")
+    tags = list(tag.finditer(stderr_text or ""))
+    segments: Dict[int, str] = {}
+    for pos, match in enumerate(tags):
+        stop = tags[pos + 1].start() if pos + 1 < len(tags) else len(stderr_text)
+        n = int(match.group(1))
+        segments[n] = segments.get(n, "") + stderr_text[match.end():stop]
+    return segments
+
+
+_EBUR128_I = re.compile(r"Integrated loudness:\s+I:\s*(-?(?:\d+(?:\.\d+)?|inf))\s*LUFS")
+_EBUR128_TP = re.compile(r"True peak:\s+Peak:\s*(-?(?:\d+(?:\.\d+)?|inf))\s*dBFS")
+
+
+def _extract_ebur128_summary(stderr_text: str) -> List[Dict[str, float]]:
+    """
+    Parses the end-of-stream summary of every ebur128 instance, in graph order.
+
+    Keys mirror loudnorm's JSON (``input_i``, ``input_tp``) so callers can
+    treat both analyzers the same way; missing values are simply absent.
+
+    Args:
+        stderr_text: The text from stderr.
+
+    Returns:
+        A list of dictionaries, one per ebur128 instance that logged anything.
+    """
+    summaries: List[Dict[str, float]] = []
+    for _, text in sorted(_split_by_filter(stderr_text, "ebur128").items()):
+        stats: Dict[str, float] = {}
+        integrated = _EBUR128_I.search(text)
+        if integrated:
+            stats["input_i"] = float(integrated.group(1))
+        peak = _EBUR128_TP.search(text)
+        if peak:
+            stats["input_tp"] = float(peak.group(1))
+        summaries.append(stats)
+    return summaries
 
 
 def _sanitize_db(value: float, min_val: float, max_val: float, default: float) -> float:
@@ -82,12 +236,46 @@ def _sanitize_db(value: float, min_val: float, max_val: float, default: float) -
     Returns:
         The sanitized value.
     """
-    try:
-        if math.isnan(value) or math.isinf(value):
-            return default
-        return max(min_val, min(max_val, value))
-    except (ValueError, TypeError):
-        return default
+    # isfinite rejects NaN and ±inf in one C-level check
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return min_val if value < min_val else max_val if value > max_val else value
+    return default
+
+
+def _db_to_linear(gain_db: float) -> float:
+    """Converts a gain in dB to the linear amplitude factor (-6.02 dB → 0.5)."""
+    return 10.0 ** (gain_db / 20.0)
+
+
+def _gain_filter(gain_left_db: float, gain_right_db: float) -> str:
+    """
+    Builds the per-channel gain as a single pan matrix.
+
+    One filter scales both channels in place, instead of the three
+    instances and extra pads of channelsplit → volume → join. Gains must
+    already be clamped with ``_sanitize_db`` (callers do it once) and are
+    written as linear factors with 6 decimals, so ffmpeg does not parse
+    "xdB" strings at filter init. The result is a plain ``-af`` chain element
+    (empty when both gains are 0 dB); combine with ``_chain``.
+
+    Raises:
+        ValueError: If a gain is outside ±24 dB (or not a number).
+    """
+    if not (-24.0 <= gain_left_db <= 24.0 and -24.0 <= gain_right_db <= 24.0):
+        raise ValueError(
+            f"Channel gains must be clamped to ±24 dB: L={gain_left_db!r}, R={gain_right_db!r}"
+        )
+    if gain_left_db == 0.0 and gain_right_db == 0.0:
+        return ""
+    return (
+        f"pan=stereo|FL={_db_to_linear(gain_left_db):.6f}*c0"
+        f"|FR={_db_to_linear(gain_right_db):.6f}*c1"
+    )
+
+
+def _chain(*filters: str) -> str:
+    """Joins ``-af`` chain elements with ``,``, skipping empty ones."""
+    return ",".join(f for f in filters if f)
 
 
 def _coalesce(*values: Any, default: Any) -> Any:
@@ -101,6 +289,14 @@ def _coalesce(*values: Any, default: Any) -> Any:
     return default
 
 
+def _as_path(value: Any, name: str) -> Path:
+    """Coerces a str / os.PathLike to Path; raises TypeError for anything else."""
+    try:
+        return Path(os.fspath(value))
+    except TypeError:
+        raise TypeError(f"{name} must be a path, not {type(value).__name__}") from None
+
+
 def _ensure_directory(path: Path) -> None:
     """Creates a directory with error handling."""
     try:
@@ -109,21 +305,138 @@ def _ensure_directory(path: Path) -> None:
         raise RuntimeError(f"Error creating directory: {path}") from e
 
 
+def _env_flag(env_key: str, default: bool = False) -> bool:
+    """Reads a boolean switch from the environment ("1", "true", "yes", "on")."""
+    raw = os.getenv(env_key)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_float(env_key: str, default: float) -> float:
+    """Reads a float from the environment; unset or malformed → default."""
+    try:
+        return float(os.getenv(env_key, default))
+    except ValueError:
+        log.warning("Invalid %s=%r, using %s", env_key, os.getenv(env_key), default)
+        return default
+
+
+@functools.lru_cache(maxsize=None)
 def _get_binary_path(name: str, env_key: str, default: str) -> str:
-    """Gets a binary path from an environment variable or a default."""
+    """
+    Gets a binary path from an environment variable or a default.
+
+    Memoized: the env var is read once per process, so changing
+    VR_FFMPEG_BIN/VR_FFPROBE_BIN mid-run is not picked up until
+    ``_get_binary_path.cache_clear()`` is called.
+    """
     return os.getenv(env_key, default or name)
 
 
+def _file_sample_digest(path: Path, chunk: int = 1 << 20) -> str:
+    """
+    blake2b over the file size plus its first and last ``chunk`` bytes.
+
+    Reads at most 2 MB regardless of file length. Not a full-content hash:
+    callers must add something derived from the whole file to their key.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(chunk))
+        if size > chunk:
+            f.seek(max(chunk, size - chunk))
+            digest.update(f.read(chunk))
+    return digest.hexdigest()
+
+
+def _probe_cache_key(source: Path, audio_filter: str) -> str:
+    """
+    Pass-1 cache key: full size and mtime_ns of ``source``, its sample digest
+    and the exact filter chain.
+
+    mtime_ns covers in-place edits that keep the size and touch neither end
+    of the file, which the sample digest alone cannot see.
+    """
+    st = os.stat(source)
+    return f"{st.st_size}:{st.st_mtime_ns}:{_file_sample_digest(source)}|{audio_filter}"
+
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_encoders(ffmpeg: str) -> frozenset:
+    """Encoder names compiled into ``ffmpeg`` (``ffmpeg -encoders``), probed once."""
+    result = sh([ffmpeg, "-hide_banner", "-encoders"], check=False)
+    names = set()
+    for line in (result.stdout or "").splitlines():
+        parts = line.split()
+        # " A....D aac   AAC (Advanced Audio Coding)": 6-char flag column, then name
+        if len(parts) >= 2 and len(parts[0]) == 6:
+            names.add(parts[1])
+    return frozenset(names)
+
+
+def _resolve_audio_encoder(ffmpeg: str, codec: str) -> str:
+    """
+    Maps the requested codec to the encoder used for pass-2.
+
+    - VR_AAC_ENCODER overrides the encoder for ``aac`` (e.g. ``libfdk_aac``).
+    - On macOS, ``aac`` uses AudioToolbox (``aac_at``) when the build has it:
+      faster than the native encoder, with comparable quality at the same
+      bitrate (not bit-identical output).
+    - Anything else is passed through unchanged.
+    """
+    if codec.lower() != "aac":
+        return codec
+    override = os.getenv("VR_AAC_ENCODER", "").strip()
+    if override:
+        return override
+    if sys.platform == "darwin" and "aac_at" in _ffmpeg_encoders(ffmpeg):
+        return "aac_at"
+    return codec
+
+
+def _encoder_args(ffmpeg: str, codec: str, bitrate: str) -> List[str]:
+    """``-c:a`` (resolved encoder) plus ``-b:a`` for the lossy codecs that take it."""
+    codec = _resolve_audio_encoder(ffmpeg, codec)
+    encoder_args = ["-c:a", codec]
+    if codec.lower() in {"aac", "aac_at", "libfdk_aac", "libopus", "libmp3lame"} and bitrate:
+        encoder_args += ["-b:a", bitrate]
+    return encoder_args
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_thread_args() -> Tuple[str, ...]:
+    """
+    Threading flags for every ffmpeg pass (placed before ``-i``).
+
+    loudnorm/ebur128 are single-threaded, but decode and the rest of the
+    graph can use every core instead of whatever a given build defaults to.
+    Counts only the CPUs this process may run on (see ``_pin_worker``).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        n = str(len(os.sched_getaffinity(0)) or 1)
+    else:
+        n = str(os.cpu_count() or 2)
+    return ("-threads", n, "-filter_threads", n, "-filter_complex_threads", n)
+
+
 class _AudioInfo(TypedDict, total=False):
     """Basic audio stream information."""
     channels: int
     sample_rate: int
     layout: str
+    codec: str
 
 
 def _probe_audio_info(file_path: Path) -> _AudioInfo:
     """
-    Extracts audio information using ffprobe.
+    Extracts audio information from the file header (soundfile/mutagen,
+    when installed) or with ffprobe.
+
+    Results are memoized per (absolute path, mtime, size), so repeated
+    probes of an unchanged file cost a stat() instead of an ffprobe process
+    spawn, however the caller spells the path.
 
     Args:
         file_path: The path to the audio file.
@@ -131,30 +444,184 @@ def _probe_audio_info(file_path: Path) -> _AudioInfo:
     Returns:
         A dictionary containing channels, sample_rate, and layout.
     """
+    path = os.path.abspath(file_path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _probe_audio_info_uncached(path)
+    return _AudioInfo(**_probe_audio_info_cached(path, st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=128)
+def _probe_audio_info_cached(path: str, mtime_ns: int, size: int) -> _AudioInfo:
+    """Cache key only; mtime_ns/size invalidate the entry when the file changes."""
+    return _probe_audio_info_uncached(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_import(name: str) -> Any:
+    """Imports an optional dependency once; None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+_LAYOUTS = {1: "mono", 2: "stereo"}
+
+
+def _probe_audio_info_header(file_path: str) -> Optional[_AudioInfo]:
+    """
+    Reads stream info from the file header, without spawning ffprobe.
+
+    Tries soundfile (wav/flac/ogg) and then mutagen (mp3/m4a/...), when
+    installed. Returns None if neither is available or can parse the file.
+    """
+    soundfile = _optional_import("soundfile")
+    if soundfile is not None:
+        try:
+            sf_info = soundfile.info(file_path)
+        except Exception:  # libsndfile rejects formats it cannot read
+            pass
+        else:
+            channels = int(sf_info.channels)
+            subtype = str(sf_info.subtype)
+            if sf_info.format in ("WAV", "WAVEX") and subtype == "PCM_16":
+                codec = "pcm_s16le"
+            else:
+                codec = subtype.lower()
+            return {
+                "channels": channels,
+                "sample_rate": int(sf_info.samplerate),
+                "layout": _LAYOUTS.get(channels, ""),
+                "codec": codec,
+            }
+    
+    mutagen = _optional_import("mutagen")
+    if mutagen is None:
+        return None
+    try:
+        info = getattr(mutagen.File(file_path), "info", None)
+    except Exception:
+        return None
+    channels = int(getattr(info, "channels", 0) or 0)
+    sample_rate = int(getattr(info, "sample_rate", 0) or 0)
+    if not channels or not sample_rate:
+        return None
+    return {
+        "channels": channels,
+        "sample_rate": sample_rate,
+        "layout": _LAYOUTS.get(channels, ""),
+        "codec": str(getattr(info, "codec", "") or ""),
+    }
+
+
+def _probe_audio_info_uncached(file_path: str) -> _AudioInfo:
+    """Reads the header directly if possible, else runs ffprobe for the first audio stream."""
+    header = _probe_audio_info_header(file_path)
+    if header is not None:
+        return header
+    
     ffprobe = _get_binary_path("ffprobe", "VR_FFPROBE_BIN", "ffprobe")
     
     cmd = [
         ffprobe, "-v", "error",
         "-select_streams", "a:0",
-        "-show_entries", "stream=channels,channel_layout,sample_rate",
-        "-of", "json",
+        "-show_entries", "stream=codec_name,channels,channel_layout,sample_rate",
+        # Flat "key=value" lines (~50 bytes): no JSON document to parse, and
+        # unlike csv the fields do not depend on ffprobe's internal order.
+        "-of", "default=noprint_wrappers=1",
         str(file_path)
     ]
     
     result = sh(cmd, "Probe audio info", check=False)
     
     try:
-        data = json.loads(result.stdout or "{}")
-        stream = (data.get("streams") or [{}])[0]
+        stream = dict(
+            line.partition("=")[::2]
+            for line in (result.stdout or "").splitlines()
+            if "=" in line
+        )
         
         return {
             "channels": int(stream.get("channels", 0) or 0),
             "sample_rate": int(stream.get("sample_rate", 0) or 0),
             "layout": str(stream.get("channel_layout") or ""),
+            "codec": str(stream.get("codec_name") or ""),
         }
     except Exception as e:
         log.warning("Error parsing audio info: %s", e)
-        return {"channels": 0, "sample_rate": 0, "layout": ""}
+        return {"channels": 0, "sample_rate": 0, "layout": "", "codec": ""}
+
+
+def _stereo_filter_for(info: _AudioInfo) -> str:
+    """
+    The ``-af`` chain converting a source to stereo 48kHz s16.
+
+    Empty for sources already in that format; mono is duplicated to L=R.
+    """
+    channels = info.get("channels", 0)
+    if (
+        channels == 2
+        and info.get("sample_rate") == 48000
+        and info.get("codec") == "pcm_s16le"
+    ):
+        return ""
+    stereo_filter = "aformat=sample_fmts=s16:sample_rates=48000:channel_layouts=stereo"
+    if channels == 1:
+        # Duplicate mono to stereo
+        stereo_filter += ",pan=stereo|c0=FL|c1=FL"
+    return stereo_filter
+
+
+def _parse_loudness_tag(key: str, value: str) -> Optional[float]:
+    """Integrated loudness (LUFS) implied by one metadata tag, or None."""
+    try:
+        number = float(value.strip().split()[0])
+    except (IndexError, ValueError):
+        return None
+    if key == "R128_TRACK_GAIN":
+        # Opus: Q7.8 gain relative to -23 LUFS
+        return -23.0 - number / 256.0
+    if key == "REPLAYGAIN_TRACK_GAIN":
+        # ReplayGain 2.0 reference level is -18 LUFS
+        return -18.0 - number
+    if key in {"R128_INTEGRATED_LOUDNESS", "BWF_LOUDNESS_VALUE", "LOUDNESS_VALUE"}:
+        return number
+    return None
+
+
+def _probe_tagged_loudness(file_path: str) -> Optional[float]:
+    """
+    Reads the integrated loudness a file declares in its tags (ffprobe).
+
+    Looks at format and stream tags for R128_TRACK_GAIN (Opus),
+    REPLAYGAIN_TRACK_GAIN and direct LUFS values (R128_INTEGRATED_LOUDNESS,
+    BWF_LOUDNESS_VALUE / LOUDNESS_VALUE). Returns None if none is present.
+    """
+    ffprobe = _get_binary_path("ffprobe", "VR_FFPROBE_BIN", "ffprobe")
+    result = sh(
+        [
+            ffprobe, "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "format_tags:stream_tags",
+            "-of", "default=noprint_wrappers=1",
+            str(file_path)
+        ],
+        "Probe loudness tags",
+        check=False
+    )
+    for line in (result.stdout or "").splitlines():
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        key = key.upper()
+        if key.startswith("TAG:"):
+            key = key[4:]
+        loudness = _parse_loudness_tag(key, value)
+        if loudness is not None and math.isfinite(loudness):
+            return loudness
+    return None
 
 
 # ===========================================================================
@@ -170,10 +637,79 @@ class LoudnessTargets:
         I: Integrated Loudness (LUFS) - typically -16.0
         LRA: Loudness Range (LU) - typically 11.0
         TP: True Peak (dBFS) - typically -2.0
+
+    The filter strings derived from the targets are built once here (the
+    instance is frozen) and excluded from eq/hash/repr:
+        probe_filter: Pass-1 loudnorm (``print_format=json``)
+        apply_filter_template: Pass-2 loudnorm; ``str.format`` with
+            mI, mLRA, mTP, mT (measured_*) and off (offset)
+        limiter_filter: ``alimiter`` capped at TP, for the linear paths
     """
     I: float    # target LUFS
     LRA: float  # target loudness range
     TP: float   # target true peak
+    probe_filter: str = field(init=False, repr=False, compare=False)
+    apply_filter_template: str = field(init=False, repr=False, compare=False)
+    limiter_filter: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        base = f"loudnorm=I={self.I}:LRA={self.LRA}:TP={self.TP}"
+        # alimiter accepts limit >= 0.0625 (-24 dBFS); level=disabled keeps
+        # it from re-normalizing the output to the limit
+        limit = max(_db_to_linear(self.TP), 0.0625)
+        # frozen dataclass: assign through object.__setattr__
+        object.__setattr__(self, "probe_filter", f"{base}:print_format=json")
+        object.__setattr__(
+            self,
+            "apply_filter_template",
+            f"{base}:measured_I={{mI}}:measured_LRA={{mLRA}}:"
+            f"measured_TP={{mTP}}:measured_thresh={{mT}}:"
+            f"offset={{off}}:linear=true:print_format=none"
+        )
+        object.__setattr__(self, "limiter_filter", f"alimiter=limit={limit:.6f}:level=disabled")
+
+
+def _estimate_pass1(
+    left_stats: Dict[str, Any],
+    right_stats: Dict[str, Any],
+    mix_stats: Dict[str, Any],
+    gain_left_db: float,
+    gain_right_db: float
+) -> Dict[str, Any]:
+    """
+    Predicts pass-1 stats of the gain-adjusted mix from the stage-1 numbers.
+
+    BS.1770 sums channel energies, so the stereo loudness is
+    ``10*log10(10^(L/10) + 10^(R/10))`` over the (gained) mono loudness of
+    each channel; the true peak moves with its channel's gain. LRA and the
+    gate threshold come from the ungained mix probe (the threshold shifted
+    by the same change in I). Gating makes this approximate (typically a
+    few tenths of a LU), hence opt-in.
+
+    Returns:
+        A loudnorm-style stats dict, or empty if any input is missing.
+    """
+    try:
+        left_i = float(left_stats["input_i"]) + gain_left_db
+        right_i = float(right_stats["input_i"]) + gain_right_db
+        left_tp = float(left_stats["input_tp"]) + gain_left_db
+        right_tp = float(right_stats["input_tp"]) + gain_right_db
+        mix_i = float(mix_stats["input_i"])
+        mix_lra = float(mix_stats["input_lra"])
+        mix_thresh = float(mix_stats["input_thresh"])
+    except (KeyError, TypeError, ValueError):
+        return {}
+    
+    est_i = 10 * math.log10(10 ** (left_i / 10) + 10 ** (right_i / 10))
+    if not all(map(math.isfinite, (est_i, left_tp, right_tp, mix_i, mix_lra, mix_thresh))):
+        return {}
+    return {
+        "input_i": est_i,
+        "input_tp": max(left_tp, right_tp),
+        "input_lra": mix_lra,
+        "input_thresh": mix_thresh + (est_i - mix_i),
+        "target_offset": 0.0,
+    }
 
 
 # ===========================================================================
@@ -185,154 +721,229 @@ class AudioProcessor:
     Processes audio with a multi-stage pipeline.
 
     Pipeline:
-    1. Convert to stereo 48kHz
-    2. Measure loudness per channel
-    3. Apply per-channel gain
-    4. Two-pass normalization with loudnorm
+    1. Measure loudness per channel of the stereo 48kHz signal
+    2. Two-pass normalization with loudnorm; stereo conversion and
+       per-channel gain applied in-graph
     """
     
-    def __init__(self, tmp: Path) -> None:
+    def __init__(self, tmp: str | os.PathLike[str]) -> None:
         """
         Args:
             tmp: The path to the temporary directory for intermediate files.
         
         Raises:
-            TypeError: If tmp is not a Path object.
+            TypeError: If tmp is not a str or os.PathLike.
         """
-        if not isinstance(tmp, Path):
-            raise TypeError(f"tmp must be a Path, not {type(tmp).__name__}")
+        tmp = _as_path(tmp, "tmp")
         
         self.tmp = tmp
         _ensure_directory(self.tmp)
+        
+        # Resolved once per instance; every pass below reuses it
+        self._ffmpeg = _get_binary_path("ffmpeg", "VR_FFMPEG_BIN", "ffmpeg")
+        
+        # Pass-1 stats cache (VR_PROBE_CACHE=0 disables); loaded on first use.
+        # Lives inside the caller's tmp, never next to it.
+        self._probe_cache_path = self.tmp / "loudnorm_cache.json"
+        self._probe_cache: Optional[Dict[str, Dict[str, Any]]] = None
     
     # -----------------------------------------------------------------------
-    # Stage 1: Ensure Stereo
+    # Pass-1 Stats Cache
     # -----------------------------------------------------------------------
     
-    def _ensure_stereo(self, source: Path) -> Path:
+    _PROBE_CACHE_MAX = 256
+    
+    def _load_probe_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Reads the on-disk cache once per instance; a broken file counts as empty."""
+        if self._probe_cache is None:
+            try:
+                data = json.loads(self._probe_cache_path.read_text(encoding="utf-8"))
+                self._probe_cache = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._probe_cache = {}
+        return self._probe_cache
+    
+    def _store_probe_cache(self, key: str, stats: Dict[str, Any]) -> None:
         """
-        Ensures the audio is stereo at 48kHz.
+        Adds an entry and rewrites the cache file atomically (temp + os.replace).
+
+        Concurrent writers can drop each other's newest entry, which only
+        costs a re-probe later; readers never see a half-written file.
+        """
+        cache = self._load_probe_cache()
+        cache.pop(key, None)
+        cache[key] = stats
+        while len(cache) > self._PROBE_CACHE_MAX:
+            cache.pop(next(iter(cache)))
+        
+        tmp_path = self._probe_cache_path.with_name(
+            f"{self._probe_cache_path.name}.{os.getpid()}.tmp"
+        )
+        try:
+            tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+            os.replace(tmp_path, self._probe_cache_path)
+        except OSError as e:
+            log.debug("Could not write loudnorm cache: %s", e)
+    
+    # -----------------------------------------------------------------------
+    # Stage 1: Per-Channel (+ Mix) Loudness (stereo 48kHz)
+    # -----------------------------------------------------------------------
+    
+    def _fused_probe(
+        self,
+        source: Path,
+        targets: LoudnessTargets
+    ) -> Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Measures L/R loudness (and the stereo mix) of the source in one ffmpeg run.
+
+        Nothing is written to disk: the stereo conversion is returned as a
+        filter chain that later passes prepend to their own graphs, so each
+        pass decodes the source directly instead of re-reading a full PCM
+        dump (~660 MB per hour of audio). Here, asplit feeds two mono
+        branches (pan), each with its own ebur128 analyzer writing to a null
+        sink. Only integrated loudness is needed per channel, so ebur128 is
+        used there instead of loudnorm's much heavier probe mode.
+
+        A third branch runs the loudnorm probe on the unmodified stereo
+        signal. When no per-channel gain turns out to be needed, those are
+        exactly the pass-1 stats, and normalize() goes straight to pass-2
+        (two ffmpeg runs in total). VR_FUSED_PROBE=0 drops this branch.
 
         Behavior:
         - Mono → Duplicates to stereo (L=R)
         - Stereo → Preserves separate channels
-        - Always: 48kHz, PCM s16le
+        - Always: 48kHz, s16
+        - Sources already in that format need no conversion chain ("")
         
         Args:
             source: The input file.
+            targets: The loudness targets.
         
         Returns:
-            The path to the stereo-converted file.
+            (stereo_filter, stats_left, stats_right, stats_mix): The
+            conversion chain (``-af`` syntax, possibly empty), two
+            dictionaries with ``input_i`` (LUFS) and ``input_tp`` (dBFS), and
+            the loudnorm JSON of the mix (empty if not measured).
         
         Raises:
             FileNotFoundError: If the input file does not exist.
         """
-        if not isinstance(source, Path):
-            raise TypeError(f"source must be a Path, not {type(source).__name__}")
+        source = _as_path(source, "source")
         
         if not source.exists():
             raise FileNotFoundError(f"Audio file not found: {source}")
         
-        ffmpeg = _get_binary_path("ffmpeg", "VR_FFMPEG_BIN", "ffmpeg")
-        output = self.tmp / "audio_stereo.wav"
+        ffmpeg = self._ffmpeg
         
-        # Detect number of channels
+        # Channel count / format decide the conversion chain
         info = _probe_audio_info(source)
-        channels = info.get("channels", 0)
-        
-        # Choose filter based on channel count
-        if channels == 1:
-            # Duplicate mono to stereo
-            audio_filter = (
-                "aformat=sample_fmts=s16:sample_rates=48000:channel_layouts=stereo,"
-                "pan=stereo|c0=FL|c1=FL"
+        
+        # framelog=verbose keeps the per-100ms lines out of stderr (default loglevel is info).
+        # Always at the source's 48kHz: ebur128 only accepts 48kHz input (a lower
+        # rate just gets resampled back up), and peak=true feeds _estimate_pass1.
+        analyzer = "ebur128=peak=true:framelog=verbose"
+        
+        stereo_filter = _stereo_filter_for(info)
+        if not stereo_filter:
+            log.debug("Source is already stereo 48kHz PCM s16le, skipping conversion: %s", source)
+        
+        if _env_flag("VR_PARALLEL_PROBE"):
+            # Opt-in alternative to the fused graph: one ffmpeg process per
+            # channel so the two analyzers use two cores.
+            left_stats, right_stats = self._measure_channels_parallel(
+                source, stereo_filter, analyzer
             )
-        else:
-            # Preserve stereo, just convert format
-            audio_filter = "aformat=sample_fmts=s16:sample_rates=48000:channel_layouts=stereo"
+            return stereo_filter, left_stats, right_stats, {}
         
-        sh(
+        with_mix = _env_flag("VR_FUSED_PROBE", True)
+        head = f"[0:a]{stereo_filter}," if stereo_filter else "[0:a]"
+        # L is declared before R, so its ebur128 gets the lower instance index
+        filter_complex = (
+            f"{head}asplit={3 if with_mix else 2}[L0][R0]{'[M0]' if with_mix else ''};"
+            f"[L0]pan=mono|c0=FL,{analyzer}[l];"
+            f"[R0]pan=mono|c0=FR,{analyzer}[r]"
+        )
+        mix_output: List[str] = []
+        if with_mix:
+            filter_complex += f";[M0]{targets.probe_filter}[m]"
+            mix_output = ["-map", "[m]", "-f", "null", "-"]
+        
+        stderr = sh_stream(
             [
                 ffmpeg, "-y", "-hide_banner", "-nostats",
+                *_ffmpeg_thread_args(),
                 "-vn", "-sn",  # No video, no subtitles
                 "-i", str(source),
-                "-af", audio_filter,
-                "-c:a", "pcm_s16le",
-                str(output)
+                "-filter_complex", filter_complex,
+                "-map", "[l]", "-f", "null", "-",
+                "-map", "[r]", "-f", "null", "-",
+                *mix_output
             ],
-            "Convert to stereo 48kHz"
-        )
+            "Measure loudness (L/R + mix)" if with_mix else "Measure loudness (L/R)"
+        ).stderr or ""
         
-        log.debug("File converted to stereo: %s", output)
-        return output
-    
-    # -----------------------------------------------------------------------
-    # Stage 2: Measure Loudness
-    # -----------------------------------------------------------------------
+        # Route each summary to its channel by the [Parsed_ebur128_N] prefix
+        blocks = _extract_ebur128_summary(stderr)
+        if len(blocks) < 2:
+            log.warning("Per-channel loudness: expected 2 ebur128 summaries, got %d", len(blocks))
+            blocks += [{}] * (2 - len(blocks))
+        left_stats, right_stats = blocks[-2], blocks[-1]
+        
+        # The mix loudnorm is the only JSON printer in the graph
+        # Not cached: normalize() uses these directly, and only the gained
+        # chains of _probe_with_gain are ever looked up
+        mix_stats = _extract_last_json(stderr) if with_mix else {}
+        
+        return stereo_filter, left_stats, right_stats, mix_stats
     
-    def _measure_loudness_per_channel(
+    def _measure_channels_parallel(
         self,
-        wav_file: Path,
-        targets: LoudnessTargets
+        source: Path,
+        stereo_filter: str,
+        analyzer: str
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        Measures loudness for L and R channels separately.
+        Measures L and R in two concurrent ffmpeg processes (VR_PARALLEL_PROBE=1).
 
-        Uses -map_channel to isolate channels.
+        Each process is capped at ``-threads 2`` so the pair does not
+        oversubscribe the machine. The GIL is not involved: the threads only
+        wait on their subprocess, and logging handlers are already locked.
         
         Args:
-            wav_file: The stereo WAV file.
-            targets: The loudness targets.
+            source: The input file.
+            stereo_filter: The stereo 48kHz conversion chain (may be empty).
+            analyzer: The analyzer filter applied after the channel pick.
         
         Returns:
-            (stats_left, stats_right): Two loudnorm JSON dictionaries.
-        
-        Raises:
-            FileNotFoundError: If the file does not exist.
+            (stats_left, stats_right)
         """
-        if not wav_file.exists():
-            raise FileNotFoundError(f"File for probe not found: {wav_file}")
-        
-        ffmpeg = _get_binary_path("ffmpeg", "VR_FFMPEG_BIN", "ffmpeg")
-        
-        loudnorm_args = (
-            f"loudnorm=I={targets.I}:LRA={targets.LRA}:TP={targets.TP}:"
-            f"print_format=json"
-        )
+        ffmpeg = self._ffmpeg
+        def probe(channel: str) -> Dict[str, Any]:
+            stderr = sh_stream(
+                [
+                    ffmpeg, "-hide_banner", "-nostats",
+                    "-threads", "2",
+                    "-vn", "-sn",
+                    "-i", str(source),
+                    "-af", _chain(stereo_filter, f"pan=mono|c0={channel}", analyzer),
+                    "-f", "null", "-"
+                ],
+                f"Measure loudness ({channel})"
+            ).stderr or ""
+            blocks = _extract_ebur128_summary(stderr)
+            if not blocks:
+                log.warning("Loudness probe (%s): ebur128 summary not found", channel)
+                return {}
+            return blocks[-1]
         
-        # Measure left channel (L)
-        left_stderr = sh(
-            [
-                ffmpeg, "-hide_banner", "-nostats",
-                "-i", str(wav_file),
-                "-map_channel", "0.0.0",  # First channel
-                "-af", loudnorm_args,
-                "-f", "null", "-"
-            ],
-            "Measure loudness (L)",
-            check=False
-        ).stderr or ""
-        
-        # Measure right channel (R)
-        right_stderr = sh(
-            [
-                ffmpeg, "-hide_banner", "-nostats",
-                "-i", str(wav_file),
-                "-map_channel", "0.0.1",  # Second channel
-                "-af", loudnorm_args,
-                "-f", "null", "-"
-            ],
-            "Measure loudness (R)",
-            check=False
-        ).stderr or ""
-        
-        left_stats = _extract_last_json(left_stderr)
-        right_stats = _extract_last_json(right_stderr)
-        
-        return left_stats, right_stats
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="vr-probe") as pool:
+            left = pool.submit(probe, "FL")
+            right = pool.submit(probe, "FR")
+            return left.result(), right.result()
     
     # -----------------------------------------------------------------------
-    # Stage 3: Apply Gain
+    # Utility: Apply Gain (standalone)
     # -----------------------------------------------------------------------
     
     def _apply_per_channel_gain(
@@ -342,14 +953,17 @@ class AudioProcessor:
         gain_right_db: float
     ) -> Path:
         """
-        Applies separate gain to each channel.
+        Applies separate gain to each channel and writes a new WAV.
+
+        Uses: pan (one gain per output channel)
 
-        Uses: channelsplit → volume → join
+        Not part of ``normalize`` (which folds the same chain into both
+        loudnorm passes); kept as a standalone utility.
         
         Args:
             wav_file: The input stereo file.
-            gain_left_db: Gain for the left channel (dB).
-            gain_right_db: Gain for the right channel (dB).
+            gain_left_db: Gain for the left channel (dB), clamped to ±24.
+            gain_right_db: Gain for the right channel (dB), clamped to ±24.
         
         Returns:
             The path to the gain-adjusted file.
@@ -360,27 +974,20 @@ class AudioProcessor:
         if not wav_file.exists():
             raise FileNotFoundError(f"File for gain not found: {wav_file}")
         
-        ffmpeg = _get_binary_path("ffmpeg", "VR_FFMPEG_BIN", "ffmpeg")
+        ffmpeg = self._ffmpeg
         output = self.tmp / "audio_balanced.wav"
         
         # Clamp gain to a safe range
         gain_l = _sanitize_db(gain_left_db, -24.0, 24.0, 0.0)
         gain_r = _sanitize_db(gain_right_db, -24.0, 24.0, 0.0)
         
-        # Build filter complex
-        filter_complex = (
-            "[0:a]channelsplit=channel_layout=stereo[FL][FR];"
-            f"[FL]volume={gain_l:.3f}dB[FL2];"
-            f"[FR]volume={gain_r:.3f}dB[FR2];"
-            "[FL2][FR2]join=inputs=2:channel_layout=stereo[aout]"
-        )
-        
-        sh(
+        # Nothing is parsed from stderr: errors only, and sh_stream keeps the tail
+        sh_stream(
             [
-                ffmpeg, "-y", "-hide_banner", "-nostats",
+                ffmpeg, "-y", "-hide_banner", "-nostats", "-loglevel", "error",
+                *_ffmpeg_thread_args(),
                 "-i", str(wav_file),
-                "-filter_complex", filter_complex,
-                "-map", "[aout]",
+                "-af", _gain_filter(gain_l, gain_r) or "anull",
                 "-ar", "48000",
                 "-c:a", "pcm_s16le",
                 str(output)
@@ -392,28 +999,98 @@ class AudioProcessor:
         return output
     
     # -----------------------------------------------------------------------
-    # Stage 4: Two-Pass Normalization
+    # Stage 2: Pre-Gain + Two-Pass Normalization
     # -----------------------------------------------------------------------
     
+    def _probe_with_gain(
+        self,
+        source: Path,
+        stereo_filter: str,
+        gain_left_db: float,
+        gain_right_db: float,
+        targets: LoudnessTargets
+    ) -> Dict[str, Any]:
+        """
+        Loudnorm pass-1 on the converted, gain-adjusted signal, without writing it.
+
+        Stereo conversion and the per-channel gain feed loudnorm directly
+        inside one filter chain, so no intermediate WAV is materialized.
+
+        Results are cached on disk under ``tmp.parent``. The key combines a
+        sampled digest of the file (size + first/last 1 MB) with the exact
+        filter graph; the graph embeds the targets and the per-channel gains,
+        which come from full-file L/R measurements, so files that only differ
+        in the middle still get different keys in practice.
+        
+        Args:
+            source: The input file.
+            stereo_filter: The stereo 48kHz conversion chain (may be empty).
+            gain_left_db: Gain for the left channel (dB).
+            gain_right_db: Gain for the right channel (dB).
+            targets: The loudness targets.
+        
+        Returns:
+            The loudnorm JSON dictionary (empty if not found).
+        """
+        ffmpeg = self._ffmpeg
+        
+        audio_filter = _chain(
+            stereo_filter,
+            _gain_filter(gain_left_db, gain_right_db),
+            targets.probe_filter
+        )
+        
+        use_cache = _env_flag("VR_PROBE_CACHE", True)
+        if use_cache:
+            key = _probe_cache_key(source, audio_filter)
+            cached = self._load_probe_cache().get(key)
+            if cached:
+                log.debug("Loudnorm pass-1 cache hit: %s", source.name)
+                return dict(cached)
+        
+        stats = _run_ffmpeg_capture_last_json(
+            [
+                ffmpeg, "-y", "-hide_banner", "-nostats",
+                *_ffmpeg_thread_args(),
+                "-vn", "-sn",
+                "-i", str(source),
+                "-af", audio_filter,
+                "-f", "null", "-"
+            ],
+            "Loudnorm pass-1 (probe)"
+        )
+        if stats and use_cache:
+            self._store_probe_cache(key, stats)
+        return stats
+    
     def _normalize_two_pass(
         self,
-        wav_file: Path,
+        source: Path,
         targets: LoudnessTargets,
         *,
         codec: str,
-        bitrate: str
+        bitrate: str,
+        stereo_filter: str = "",
+        gain_left_db: float = 0.0,
+        gain_right_db: float = 0.0
     ) -> Path:
         """
-        Performs two-pass normalization with loudnorm.
+        Performs two-pass normalization with loudnorm after per-channel gain.
 
-        Pass 1: Probes and extracts statistics.
-        Pass 2: Applies normalization using measured_* and offset.
+        Both passes decode ``source`` directly and run the stereo conversion,
+        the gain and loudnorm in one chain.
+        Pass 1: Probes the gain-adjusted signal and extracts statistics.
+        Pass 2: Applies the same chain, then normalization using measured_*
+        and offset; this is the only encode.
         
         Args:
-            wav_file: The input file.
+            source: The input file.
             targets: The loudness targets.
             codec: The output codec (e.g., "aac").
             bitrate: The output bitrate (e.g., "192k").
+            stereo_filter: The stereo 48kHz conversion chain (may be empty).
+            gain_left_db: Pre-gain for the left channel (dB).
+            gain_right_db: Pre-gain for the right channel (dB).
         
         Returns:
             The path to the normalized file.
@@ -422,32 +1099,69 @@ class AudioProcessor:
             FileNotFoundError: If the file does not exist.
             RuntimeError: If the first pass fails.
         """
-        if not wav_file.exists():
-            raise FileNotFoundError(f"File for loudnorm not found: {wav_file}")
-        
-        ffmpeg = _get_binary_path("ffmpeg", "VR_FFMPEG_BIN", "ffmpeg")
+        if not source.exists():
+            raise FileNotFoundError(f"File for loudnorm not found: {source}")
         
         # Pass 1: Probe
-        probe_filter = (
-            f"loudnorm=I={targets.I}:LRA={targets.LRA}:TP={targets.TP}:"
-            f"print_format=json"
+        stats = self._probe_with_gain(
+            source, stereo_filter, gain_left_db, gain_right_db, targets
         )
-        
-        probe_stderr = sh(
-            [
-                ffmpeg, "-y", "-hide_banner", "-nostats",
-                "-i", str(wav_file),
-                "-af", probe_filter,
-                "-f", "null", "-"
-            ],
-            "Loudnorm pass-1 (probe)",
-            check=False
-        ).stderr or ""
-        
-        stats = _extract_last_json(probe_stderr)
         if not stats:
             raise RuntimeError("Loudnorm pass-1 failed: JSON not found")
         
+        # Pass 2: Apply
+        return self._fused_apply(
+            source,
+            targets,
+            stats,
+            codec=codec,
+            bitrate=bitrate,
+            stereo_filter=stereo_filter,
+            gain_left_db=gain_left_db,
+            gain_right_db=gain_right_db
+        )
+    
+    def _fused_apply(
+        self,
+        source: Path,
+        targets: LoudnessTargets,
+        stats: Dict[str, Any],
+        *,
+        codec: str,
+        bitrate: str,
+        stereo_filter: str = "",
+        gain_left_db: float = 0.0,
+        gain_right_db: float = 0.0
+    ) -> Path:
+        """
+        Loudnorm pass-2: one ffmpeg run from the source to the encoded file.
+
+        Stereo conversion, per-channel gain and linear loudnorm (driven by
+        the pass-1 ``stats``) run in one chain. ``-ar 48000`` stays: loudnorm
+        always outputs at its internal 192kHz rate.
+
+        Opt-in (VR_LINEAR_APPLY=1): when a plain gain already meets the
+        targets (the gained true peak stays under TP and the LRA is within
+        target), loudnorm's linear mode would apply just that gain, so the
+        chain uses ``volume`` + a safety ``alimiter`` instead, skipping
+        loudnorm's look-ahead and 192kHz upsampling. Off by default: the
+        output then comes from a different filter graph than loudnorm's.
+        
+        Args:
+            source: The input file.
+            targets: The loudness targets.
+            stats: Pass-1 loudnorm JSON for exactly this chain.
+            codec: The output codec (e.g., "aac").
+            bitrate: The output bitrate (e.g., "192k").
+            stereo_filter: The stereo 48kHz conversion chain (may be empty).
+            gain_left_db: Pre-gain for the left channel (dB).
+            gain_right_db: Pre-gain for the right channel (dB).
+        
+        Returns:
+            The path to the normalized file.
+        """
+        ffmpeg = self._ffmpeg
+        
         # Extract stats with fallbacks
         measured_I = float(_coalesce(
             stats.get("input_i"),
@@ -475,26 +1189,36 @@ class AudioProcessor:
             default=0.0
         ))
         
-        # Pass 2: Apply
         output = self.tmp / "audio_loudnorm.m4a"
         
-        apply_filter = (
-            f"loudnorm=I={targets.I}:LRA={targets.LRA}:TP={targets.TP}:"
-            f"measured_I={measured_I}:measured_LRA={measured_LRA}:"
-            f"measured_TP={measured_TP}:measured_thresh={measured_thresh}:"
-            f"offset={offset}:linear=true:print_format=summary"
-        )
+        # Same feasibility test loudnorm runs before falling back to dynamic mode
+        linear_gain = targets.I - measured_I
+        if (
+            _env_flag("VR_LINEAR_APPLY")
+            and math.isfinite(linear_gain)
+            and measured_TP + linear_gain <= targets.TP
+            and measured_LRA <= targets.LRA
+        ):
+            apply_filter = (
+                f"volume={_db_to_linear(linear_gain):.6f},{targets.limiter_filter}"
+            )
+            log.debug("Linear apply: gain=%.2fdB (no loudnorm pass-2)", linear_gain)
+        else:
+            apply_filter = targets.apply_filter_template.format(
+                mI=measured_I, mLRA=measured_LRA, mTP=measured_TP,
+                mT=measured_thresh, off=offset
+            )
         
-        # Codec settings
-        encoder_args = ["-c:a", codec]
-        if codec.lower() in {"aac", "libfdk_aac", "libopus", "libmp3lame"} and bitrate:
-            encoder_args += ["-b:a", bitrate]
+        encoder_args = _encoder_args(ffmpeg, codec, bitrate)
         
-        sh(
+        # The encode's stderr is only needed on failure: errors only, bounded tail
+        sh_stream(
             [
-                ffmpeg, "-y", "-hide_banner", "-nostats",
-                "-i", str(wav_file),
-                "-af", apply_filter,
+                ffmpeg, "-y", "-hide_banner", "-nostats", "-loglevel", "error",
+                *_ffmpeg_thread_args(),
+                "-vn", "-sn",
+                "-i", str(source),
+                "-af", _chain(stereo_filter, _gain_filter(gain_left_db, gain_right_db), apply_filter),
                 "-ar", "48000",
                 *encoder_args,
                 str(output)
@@ -509,22 +1233,75 @@ class AudioProcessor:
         
         return output
     
+    def _transcode_only(
+        self,
+        source: Path,
+        targets: LoudnessTargets,
+        *,
+        codec: str,
+        bitrate: str
+    ) -> Path:
+        """
+        Encodes an already-normalized source: stereo conversion + peak guard.
+
+        The loudness tags say nothing about the true peak, so an
+        ``alimiter`` at TP stays in the chain as a safety net; it only acts
+        on peaks above the target.
+        
+        Args:
+            source: The input file.
+            targets: The loudness targets (TP is used).
+            codec: The output codec (e.g., "aac").
+            bitrate: The output bitrate (e.g., "192k").
+        
+        Returns:
+            The path to the encoded file.
+        """
+        ffmpeg = self._ffmpeg
+        output = self.tmp / "audio_loudnorm.m4a"
+        
+        sh_stream(
+            [
+                ffmpeg, "-y", "-hide_banner", "-nostats", "-loglevel", "error",
+                *_ffmpeg_thread_args(),
+                "-vn", "-sn",
+                "-i", str(source),
+                "-af", _chain(
+                    _stereo_filter_for(_probe_audio_info(source)),
+                    targets.limiter_filter
+                ),
+                "-ar", "48000",
+                *_encoder_args(ffmpeg, codec, bitrate),
+                str(output)
+            ],
+            "Transcode (loudness tags already on target)"
+        )
+        return output
+    
     # -----------------------------------------------------------------------
     # Main Public Method
     # -----------------------------------------------------------------------
     
-    def normalize(self, source: Path, config: Any) -> Path:
+    def normalize(self, source: str | os.PathLike[str], config: Any) -> Path:
         """
         Full audio normalization pipeline.
         
         Stages:
-        1. Convert to stereo 48kHz
-        2. Measure loudness per channel
-        3. Apply pre-gain to L/R
-        4. Two-pass EBU R128 normalization
+        1. Measure loudness per channel (and loudnorm pass-1 of the mix)
+           of the stereo 48kHz signal, in one ffmpeg run
+        2. Two-pass EBU R128 normalization with the stereo conversion and
+           the L/R pre-gain folded into both passes (no intermediate WAVs);
+           pass-1 is skipped when no pre-gain is needed (or, with
+           VR_ESTIMATE_PASS1=1, predicted from the stage-1 numbers)
+        
+        With VR_TRUST_LOUDNESS_TAGS=1, sources whose tags already declare
+        the target loudness (±0.5 LU) skip both stages and are only
+        transcoded. With VR_LINEAR_APPLY=1, pass-2 uses a plain gain plus a
+        safety limiter instead of loudnorm when that gain meets the targets
+        (see ``_fused_apply``).
         
         Args:
-            source: Path to the input audio file.
+            source: Path to the input audio file (str or os.PathLike).
             config: A config object with attributes:
                 - target_lufs: Target LUFS (e.g., -16.0)
                 - target_lra: Target LRA (e.g., 11.0)
@@ -536,7 +1313,7 @@ class AudioProcessor:
             Path to the normalized audio file.
         
         Raises:
-            TypeError: If source or config is invalid.
+            TypeError: If source is not a path or config is invalid.
             FileNotFoundError: If the input file does not exist.
         
         Example:
@@ -546,8 +1323,7 @@ class AudioProcessor:
             ...     config
             ... )
         """
-        if not isinstance(source, Path):
-            raise TypeError(f"source must be a Path, not {type(source).__name__}")
+        source = _as_path(source, "source")
         
         if not source.exists():
             raise FileNotFoundError(f"Audio file not found: {source}")
@@ -570,11 +1346,20 @@ class AudioProcessor:
         
         log.info("Starting audio normalization: %s", source.name)
         
-        # Stage 1: Stereo 48kHz
-        stereo_file = self._ensure_stereo(source)
+        # VR_TRUST_LOUDNESS_TAGS=1: a file that declares on-target loudness
+        # (R128 / ReplayGain / BWF tags) is only transcoded
+        if _env_flag("VR_TRUST_LOUDNESS_TAGS"):
+            tagged = _probe_tagged_loudness(str(source))
+            tolerance = _env_float("VR_LOUDNESS_TAG_TOLERANCE", 0.5)
+            if tagged is not None and abs(tagged - targets.I) <= tolerance:
+                log.info(
+                    "Loudness tags report %.2f LUFS (target %.2f): skipping normalization",
+                    tagged, targets.I
+                )
+                return self._transcode_only(source, targets, codec=codec, bitrate=bitrate)
         
-        # Stage 2: Measure each channel
-        left_stats, right_stats = self._measure_loudness_per_channel(stereo_file, targets)
+        # Stage 1: Loudness of each channel (and the mix) of the stereo 48kHz signal
+        stereo_filter, left_stats, right_stats, mix_stats = self._fused_probe(source, targets)
         
         # Extract loudness of each channel
         input_left = float(_coalesce(
@@ -592,16 +1377,57 @@ class AudioProcessor:
         gain_left = _sanitize_db(targets.I - input_left, -24.0, 24.0, 0.0)
         gain_right = _sanitize_db(targets.I - input_right, -24.0, 24.0, 0.0)
         
-        # Stage 3: Apply gain
-        balanced_file = self._apply_per_channel_gain(stereo_file, gain_left, gain_right)
+        # Balanced L/R: a pre-gain would only shift both channels by the same
+        # amount, which loudnorm's own gain covers, so drop the pan stage
+        balance_eps = _env_float("VR_CHANNEL_BALANCE_EPS", 0.5)
+        if abs(gain_left - gain_right) < balance_eps:
+            log.info(
+                "Skipping per-channel gain (L/R delta %.2f LU < %.2f)",
+                abs(gain_left - gain_right), balance_eps
+            )
+            gain_left = gain_right = 0.0
         
-        # Stage 4: Final normalization
-        final_file = self._normalize_two_pass(
-            balanced_file,
-            targets,
-            codec=codec,
-            bitrate=bitrate
-        )
+        # Stage 2: Pre-gain + final normalization
+        estimate: Dict[str, Any] = {}
+        if mix_stats and (gain_left or gain_right) and _env_flag("VR_ESTIMATE_PASS1"):
+            estimate = _estimate_pass1(
+                left_stats, right_stats, mix_stats, gain_left, gain_right
+            )
+        
+        if mix_stats and gain_left == 0.0 and gain_right == 0.0:
+            # Nothing changes the signal before loudnorm: stage 1 already
+            # measured pass-1 for this exact chain
+            final_file = self._fused_apply(
+                source,
+                targets,
+                mix_stats,
+                codec=codec,
+                bitrate=bitrate,
+                stereo_filter=stereo_filter
+            )
+        elif estimate:
+            # VR_ESTIMATE_PASS1=1: pass-1 predicted from stage 1, no extra decode
+            log.info("Using estimated pass-1 stats (I=%.2f LUFS)", estimate["input_i"])
+            final_file = self._fused_apply(
+                source,
+                targets,
+                estimate,
+                codec=codec,
+                bitrate=bitrate,
+                stereo_filter=stereo_filter,
+                gain_left_db=gain_left,
+                gain_right_db=gain_right
+            )
+        else:
+            final_file = self._normalize_two_pass(
+                source,
+                targets,
+                codec=codec,
+                bitrate=bitrate,
+                stereo_filter=stereo_filter,
+                gain_left_db=gain_left,
+                gain_right_db=gain_right
+            )
         
         log.info(
             "✅ Normalization complete: "
@@ -614,6 +1440,79 @@ class AudioProcessor:
         )
         
         return final_file
+    
+    def normalize_batch(
+        self,
+        sources: Sequence[str | os.PathLike[str]],
+        config: Any
+    ) -> List[Path]:
+        """
+        Normalizes several files in parallel worker processes.
+
+        Each job runs in its own ``tmp/batch_<i>`` directory with its own
+        AudioProcessor, so intermediate and output names never collide.
+        Workers default to half the CPU count (each job's ffmpeg already
+        keeps a couple of cores busy); override with VR_PARALLEL_JOBS.
+        VR_PIN_WORKERS=1 (Linux) pins each worker, and the ffmpeg processes
+        it spawns, to its own slice of the CPUs so jobs do not migrate
+        between cores and evict each other's caches.
+        
+        Args:
+            sources: Input audio files (str or os.PathLike, like ``normalize``).
+            config: The same config object ``normalize`` expects (must be
+                picklable when more than one worker is used).
+        
+        Returns:
+            Paths to the normalized files, in the order of ``sources``.
+        """
+        sources = [_as_path(source, "source") for source in sources]
+        if not sources:
+            return []
+        
+        workers = int(os.getenv("VR_PARALLEL_JOBS", "0") or 0)
+        if workers <= 0:
+            workers = max(1, (os.cpu_count() or 2) // 2)
+        workers = min(workers, len(sources))
+        
+        tmp_dirs = [self.tmp / f"batch_{i}" for i in range(len(sources))]
+        
+        if workers == 1:
+            return [
+                _normalize_in_dir(tmp_dir, source, config)
+                for tmp_dir, source in zip(tmp_dirs, sources)
+            ]
+        
+        log.info("Batch normalization: %d files, %d workers", len(sources), workers)
+        pool_args: Dict[str, Any] = {}
+        if _env_flag("VR_PIN_WORKERS") and hasattr(os, "sched_setaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+            if len(cores) >= workers:
+                # Each worker takes one contiguous slice off the queue at startup
+                slices = multiprocessing.SimpleQueue()
+                for i in range(workers):
+                    slices.put(cores[i * len(cores) // workers:(i + 1) * len(cores) // workers])
+                pool_args = {"initializer": _pin_worker, "initargs": (slices,)}
+        with ProcessPoolExecutor(max_workers=workers, **pool_args) as pool:
+            return list(pool.map(
+                _normalize_in_dir, tmp_dirs, sources, [config] * len(sources)
+            ))
+
+
+def _pin_worker(slices: Any) -> None:
+    """Process-pool initializer: pins this worker to the next CPU slice."""
+    cores = slices.get()
+    try:
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        log.debug("Could not pin worker to %s: %s", cores, e)
+        return
+    # Thread flags were possibly computed before pinning (fork); size them again
+    _ffmpeg_thread_args.cache_clear()
+
+
+def _normalize_in_dir(tmp: Path, source: Path, config: Any) -> Path:
+    """Process-pool entry point for ``AudioProcessor.normalize_batch``."""
+    return AudioProcessor(tmp).normalize(source, config)
 
 
 # ===========================================================================
@@ -12,12 +12,34 @@ from __future__ import annotations
 
 import enum
 import json
+import logging
 import os
 import re
-from dataclasses import dataclass, asdict, field
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
 from pathlib import Path
 from typing import Optional, Any, Dict
 
+# orjson (اختیاری) برای to_json؛ در نبودش json استاندارد
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+log = logging.getLogger("VideoRobot.config")
+
+# PyYAML یک بار در import؛ (yaml, Loader, Dumper) یا None اگر نصب نیست
+try:
+    import yaml as _yaml_mod  # type: ignore
+except ImportError:
+    _YAML = None
+else:
+    try:
+        from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+        log.warning("libyaml در دسترس نیست؛ YAML با parser خالص پایتون (کند) خوانده می‌شود")
+    _YAML = (_yaml_mod, _YamlLoader, _YamlDumper)
+
 
 # ===========================================================================
 # SECTION 1: مدیریت مسیرها
@@ -435,6 +457,70 @@ class ShortsCfg:
 # SECTION 5: کلاس اصلی Config
 # ===========================================================================
 
+_ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+# نام فیلدهای هر کلاس dataclass؛ fields() در هر فراخوانی tuple جدید می‌سازد
+_FIELDS_CACHE: Dict[type, tuple] = {}
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """
+    تبدیل بازگشتی به انواع قابل سریالیزه در یک پیمایش
+    
+    جایگزین asdict + walk: dataclass ها مستقیم به dict تبدیل می‌شوند (بدون
+    deepcopy برگ‌ها)، Path → str، Aspect → "9:16"، بقیه Enum ها → value.
+    """
+    cls = type(obj)
+    if cls in _ATOMIC_TYPES:
+        return obj
+    names = _FIELDS_CACHE.get(cls)
+    if names is None and is_dataclass(obj):
+        names = _FIELDS_CACHE[cls] = tuple(f.name for f in fields(cls))
+    if names is not None:
+        return {name: _to_jsonable(getattr(obj, name)) for name in names}
+    if cls is list or cls is tuple:
+        return [_to_jsonable(v) for v in obj]
+    if cls is dict:
+        return {k: _to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, Aspect):
+        # فرمت خوانا به جای tuple
+        width, height = obj.value
+        return f"{width}:{height}"
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    return obj
+
+
+# (نام‌ها، (نام، پیش‌فرض) فیلدها به ترتیب تعریف) برای ساخت positional در _build
+_BUILD_CACHE: Dict[type, tuple] = {}
+
+
+def _build(cls: type, d: Dict[str, Any]) -> Any:
+    """
+    ساخت dataclass تخت با آرگومان‌های positional به ترتیب fields()
+    
+    بدون dict موقت ``**d``؛ مثل ``cls(**d)``، کلید ناشناخته (مثلاً غلط املایی
+    در YAML) و فیلد الزامیِ غایب TypeError می‌دهند.
+    """
+    cached = _BUILD_CACHE.get(cls)
+    if cached is None:
+        specs = tuple((f.name, f.default) for f in fields(cls))
+        cached = _BUILD_CACHE[cls] = (frozenset(name for name, _ in specs), specs)
+    names, specs = cached
+    unknown = d.keys() - names
+    if unknown:
+        raise TypeError(f"{cls.__name__}: کلید ناشناخته {sorted(unknown)}")
+    args = []
+    for name, default in specs:
+        value = d.get(name, default)
+        if value is MISSING:
+            raise TypeError(f"{cls.__name__}: فیلد الزامی '{name}' وجود ندارد")
+        args.append(value)
+    return cls(*args)
+
+
 @dataclass(slots=True)
 class ProjectCfg:
     """تنظیمات کامل پروژه"""
@@ -469,57 +555,50 @@ class ProjectCfg:
         
         return self
     
+    def _normalize(self) -> ProjectCfg:
+        """
+        فقط نرمال‌سازی‌های validate (رنگ‌ها با #، enum ها) بدون بررسی محدوده‌ها
+        
+        برای داده‌ای که قبلاً validate شده ولی خام ذخیره شده (کش YAML)؛ نتیجه
+        همان چیزی است که validate برمی‌گرداند.
+        """
+        for section in (self.captions, self.cta):
+            section.position = CaptionPosition.parse(section.position)
+        self.captions.active_color = _ensure_hex_color(self.captions.active_color)
+        self.captions.keyword_color = _ensure_hex_color(self.captions.keyword_color)
+        self.cta.key_color = _ensure_hex_color(self.cta.key_color)
+        self.visual.aspect = Aspect.parse(self.visual.aspect)
+        self.shorts.mode = ShortsMode.parse(self.shorts.mode)
+        return self
+    
     # -----------------------------------------------------------------------
     # I/O Methods
     # -----------------------------------------------------------------------
     
     def to_dict(self) -> Dict[str, Any]:
-        """تبدیل به Dictionary"""
-        data = asdict(self)
-        
-        def fix_value(obj: Any) -> Any:
-            """تبدیل انواع خاص به مقادیر قابل سریالیزه"""
-            if isinstance(obj, Path):
-                return str(obj)
-            if isinstance(obj, enum.Enum):
-                return obj.value
-            return obj
-        
-        def walk_dict(x: Any) -> Any:
-            """پیمایش بازگشتی ساختار"""
-            if isinstance(x, dict):
-                return {k: walk_dict(fix_value(v)) for k, v in x.items()}
-            if isinstance(x, list):
-                return [walk_dict(fix_value(v)) for v in x]
-            return fix_value(x)
-        
-        result = walk_dict(data)
-        
-        # تبدیل Aspect به فرمت خوانا
-        if "visual" in result and isinstance(self.visual.aspect, Aspect):
-            aspect_map = {
-                Aspect.V9x16: "9:16",
-                Aspect.V1x1: "1:1",
-                Aspect.V16x9: "16:9",
-            }
-            result["visual"]["aspect"] = aspect_map[self.visual.aspect]
-        
-        return result
+        """تبدیل به Dictionary (یک پیمایش، بدون asdict و deepcopy)"""
+        return _to_jsonable(self)
     
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> ProjectCfg:
-        """ساخت از Dictionary"""
+    def from_dict(data: Dict[str, Any], skip_validate: bool = False) -> ProjectCfg:
+        """
+        ساخت از Dictionary
+        
+        ``skip_validate=True`` فقط برای داده‌ای که قبلاً اعتبارسنجی شده
+        (مثل کش JSON کنار YAML که تنها پس از from_dict موفق نوشته می‌شود):
+        بررسی محدوده‌ها حذف می‌شود ولی نرمال‌سازی (``_normalize``) انجام می‌شود.
+        """
         visual_data = data.get("visual", {})
         shorts_data = data.get("shorts", {})
         
         config = ProjectCfg(
-            audio=AudioCfg(**data["audio"]),
-            captions=CaptionCfg(**data["captions"]),
-            figures=FigureCfg(**data["figures"]),
-            intro_outro=IntroOutroCfg(**data["intro_outro"]),
-            cta=CTACfg(**data["cta"]),
-            bgm=BGMCfg(**data["bgm"]),
-            broll=BrollCfg(**data["broll"]),
+            audio=_build(AudioCfg, data["audio"]),
+            captions=_build(CaptionCfg, data["captions"]),
+            figures=_build(FigureCfg, data["figures"]),
+            intro_outro=_build(IntroOutroCfg, data["intro_outro"]),
+            cta=_build(CTACfg, data["cta"]),
+            bgm=_build(BGMCfg, data["bgm"]),
+            broll=_build(BrollCfg, data["broll"]),
             visual=VisualCfg(
                 bg_image=visual_data["bg_image"],
                 aspect=Aspect.parse(visual_data.get("aspect", "16:9")),
@@ -535,6 +614,8 @@ class ProjectCfg:
             paths=Paths(**data["paths"]).resolve_all() if data.get("paths") else None,
         )
         
+        if skip_validate:
+            return config._normalize()
         return config.validate()
     
     @staticmethod
@@ -545,28 +626,49 @@ class ProjectCfg:
     @staticmethod
     def from_yaml(text: str) -> ProjectCfg:
         """بارگذاری از YAML"""
-        try:
-            import yaml  # type: ignore
-        except ImportError as e:
-            raise RuntimeError(
-                "PyYAML نصب نیست. برای خواندن YAML نصب کنید: pip install pyyaml"
-            ) from e
-        
-        return ProjectCfg.from_dict(yaml.safe_load(text))
+        return ProjectCfg.from_dict(_parse_yaml(text))
     
     def to_json(self, indent: int = 2) -> str:
-        """تبدیل به JSON"""
-        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+        """
+        تبدیل به JSON (با orjson وقتی نصب است و indent=2، که تنها تورفتگی orjson است)
+        
+        در مسیر orjson کلیدهای غیر رشته‌ای مثل json به رشته تبدیل می‌شوند
+        (OPT_NON_STR_KEYS)، ولی NaN/Infinity به ``null`` تبدیل می‌شوند نه ``NaN``.
+        """
+        data = self.to_dict()
+        if _orjson is not None and indent == 2:
+            option = _orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS
+            return _orjson.dumps(data, option=option).decode("utf-8")
+        return json.dumps(data, indent=indent, ensure_ascii=False)
     
     @staticmethod
     def load_from_file(path: Path) -> ProjectCfg:
-        """بارگذاری از فایل (تشخیص خودکار فرمت)"""
-        content = path.read_text(encoding="utf-8")
+        """
+        بارگذاری از فایل (تشخیص خودکار فرمت)
         
+        برای YAML، دیکشنری parse‌شده در ``<name>.cache.json`` کنار فایل ذخیره
+        می‌شود (با mtime_ns و size فایل منبع)؛ تا وقتی فایل تغییر نکرده،
+        بارگذاری‌های بعدی فقط JSON می‌خوانند و فقط نرمال‌سازی می‌شوند، نه بررسی
+        محدوده (کش فقط بعد از اعتبارسنجی موفق نوشته می‌شود). VR_CFG_CACHE=0 غیرفعالش می‌کند.
+        """
         if path.suffix.lower() in (".yaml", ".yml"):
-            return ProjectCfg.from_yaml(content)
-        elif path.suffix.lower() == ".json":
-            return ProjectCfg.from_json(content)
+            use_cache = os.getenv("VR_CFG_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"}
+            if use_cache:
+                data = _read_cfg_cache(path)
+                if data is not None:
+                    return ProjectCfg.from_dict(data, skip_validate=True)
+            
+            # parser مستقیماً از فایل می‌خواند؛ رشته میانی ساخته نمی‌شود
+            with path.open("rb") as f:
+                data = _parse_yaml(f)
+            cfg = ProjectCfg.from_dict(data)
+            if use_cache:
+                _write_cfg_cache(path, data)
+            return cfg
+        
+        if path.suffix.lower() == ".json":
+            with path.open("rb") as f:
+                return ProjectCfg.from_dict(json.load(f))
         else:
             raise ValueError(f"فرمت فایل پشتیبانی نمی‌شود: {path.suffix}")
     
@@ -575,18 +677,81 @@ class ProjectCfg:
         if path.suffix.lower() == ".json":
             path.write_text(self.to_json(), encoding="utf-8")
         elif path.suffix.lower() in (".yaml", ".yml"):
-            try:
-                import yaml  # type: ignore
-                path.write_text(
-                    yaml.dump(self.to_dict(), allow_unicode=True, sort_keys=False),
-                    encoding="utf-8"
-                )
-            except ImportError:
+            if _YAML is None:
                 raise RuntimeError("PyYAML نصب نیست")
+            yaml, _, dumper = _YAML
+            # خروجی to_dict فقط انواع ساده دارد، پس Safe dumper کافی است
+            path.write_text(
+                yaml.dump(self.to_dict(), Dumper=dumper, allow_unicode=True, sort_keys=False),
+                encoding="utf-8"
+            )
         else:
             raise ValueError(f"فرمت فایل پشتیبانی نمی‌شود: {path.suffix}")
 
 
+# ---------------------------------------------------------------------------
+# YAML و کش JSON آن
+# ---------------------------------------------------------------------------
+
+def _parse_yaml(stream: Any) -> Any:
+    """
+    parse امن YAML؛ libyaml (CSafeLoader) در صورت وجود، وگرنه parser خالص پایتون
+    
+    ``stream`` می‌تواند رشته یا فایل باز (متنی یا باینری UTF-8) باشد.
+    """
+    if _YAML is None:
+        raise RuntimeError(
+            "PyYAML نصب نیست. برای خواندن YAML نصب کنید: pip install pyyaml"
+        )
+    
+    yaml, loader, _ = _YAML
+    return yaml.load(stream, Loader=loader)
+
+
+def _cfg_cache_path(path: Path) -> Path:
+    """مسیر sidecar کش: config.yaml → config.yaml.cache.json"""
+    return path.with_name(path.name + ".cache.json")
+
+
+def _read_cfg_cache(path: Path) -> Optional[Dict[str, Any]]:
+    """دیکشنری کش‌شده، اگر با mtime_ns/size فعلی فایل منبع بخواند؛ وگرنه None"""
+    try:
+        st = path.stat()
+        with _cfg_cache_path(path).open("rb") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("mtime_ns") != st.st_mtime_ns
+        or cached.get("size") != st.st_size
+        or not isinstance(cached.get("data"), dict)
+    ):
+        return None
+    return cached["data"]
+
+
+def _write_cfg_cache(path: Path, data: Dict[str, Any]) -> None:
+    """
+    نوشتن اتمیک کش (فایل موقت + os.replace)
+    
+    خروجی خام YAML (نه to_dict) ذخیره می‌شود تا from_dict دقیقاً همان ورودی را
+    ببیند. مقادیر غیر JSON (مثل تاریخ YAML) یا دایرکتوری فقط‌خواندنی → بدون کش.
+    """
+    try:
+        st = path.stat()
+        payload = json.dumps(
+            {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data},
+            ensure_ascii=False,
+        )
+        cache = _cfg_cache_path(path)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, cache)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 # ===========================================================================
 # SECTION 6: ثابت‌های عمومی
 # ===========================================================================
@@ -11,10 +11,13 @@ Flask REST API:
 """
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
 import os
 import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 
@@ -23,12 +26,11 @@ from flask_cors import CORS
 
 # بخش داخلی
 from .config import Paths, ProjectCfg, AudioCfg, CaptionCfg, FigureCfg, IntroOutroCfg, CTACfg, BGMCfg, BrollCfg, VisualCfg, ShortsCfg, Aspect, CaptionPosition, ShortsMode, FONTS
-from .utils import docs_guard, mount_drive_once, resolve_drive_base
+from .utils import docs_guard, mount_drive_once, resolve_drive_base, setup_logging, sh_stream
 from .renderer_service import renderer_bp, RendererQueue
 
-# تنظیمات لوگ
-LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-logging.basicConfig(level=os.getenv("VR_LOG_LEVEL", "INFO"), format=LOG_FORMAT)
+# تنظیمات لوگ (یک مسیر واحد: utils.setup_logging)
+setup_logging()
 log = logging.getLogger("VideoRobot.http")
 
 # ============ مدیریت مسیرها و اولیه‌سازی ============
@@ -46,6 +48,8 @@ def _ensure_directories(paths: Paths) -> None:
     for d in required:
         d.mkdir(parents=True, exist_ok=True)
 
+# یک بار در هر پروسه: docs_guard و mount درایو (subprocess/فایل‌سیستم) تکرار نمی‌شوند
+@functools.lru_cache(maxsize=1)
 def _initialize_paths(use_drive: bool = True) -> Paths:
     docs_guard()
     base_local = Path(os.getenv("VR_BASE_LOCAL", "/content/VideoRobot")).resolve()
@@ -75,12 +79,12 @@ PATHS = _initialize_paths(use_drive=True)
 # ============ توابع کمکی FFmpeg و فایل ============
 
 def _run_ffmpeg(cmd: List[str], description: str = "FFmpeg operation") -> None:
-    try:
-        result = __import__("subprocess").run(cmd, capture_output=True, text=True, check=True)
-        log.info("%s انجام شد", description)
-    except __import__("subprocess").CalledProcessError as e:
-        log.error("%s شکست خورد: %s", description, e.stderr)
-        raise RuntimeError(f"{description} failed: {e.stderr}")
+    # sh_stream: stdout دور ریخته می‌شود و فقط ۶۴ کیلوبایت آخر stderr برای پیام خطا می‌ماند
+    result = sh_stream(cmd, check=False, tail_kb=64)
+    if result.returncode != 0:
+        log.error("%s شکست خورد: %s", description, result.stderr)
+        raise RuntimeError(f"{description} failed: {result.stderr}")
+    log.info("%s انجام شد", description)
 
 def _concatenate_audio_files(basenames: List[str]) -> str:
     if not basenames:
@@ -89,7 +93,8 @@ def _concatenate_audio_files(basenames: List[str]) -> str:
         return basenames[0]
 
     key = "|".join(basenames).encode("utf-8", "ignore")
-    hash_str = hashlib.sha1(key).hexdigest()[:10]
+    # فقط برای یکتایی نام فایل؛ blake2b با digest_size=5 همان ۱۰ کاراکتر hex را می‌دهد
+    hash_str = hashlib.blake2b(key, digest_size=5).hexdigest()
     output_name = f"concat_{hash_str}.wav"
     output_path = PATHS.assets / output_name
 
@@ -98,11 +103,13 @@ def _concatenate_audio_files(basenames: List[str]) -> str:
         return output_name
 
     list_file = PATHS.tmp / f"concat_{hash_str}.txt"
-    lines = []
+    # مستقیم bytes: بدون join رشته‌ای و encode دوباره کل متن
+    buf = bytearray()
     for b in basenames:
-        fp = (PATHS.assets / b).as_posix().replace("'", r"\'")
-        lines.append(f"file '{fp}'")
-    list_file.write_text("\n".join(lines), encoding="utf-8")
+        buf += b"file '"
+        buf += (PATHS.assets / b).as_posix().replace("'", r"\'").encode("utf-8")
+        buf += b"'\n"
+    list_file.write_bytes(buf)
 
     cmd = [
         "ffmpeg", "-y", "-hide_banner",
@@ -116,41 +123,58 @@ def _concatenate_audio_files(basenames: List[str]) -> str:
 
 def _copy_file_to_assets(src: str | Path) -> str:
     source = Path(str(src))
-    if not source.exists() or not source.is_file():
+    try:
+        src_st = source.stat()
+    except OSError:
+        src_st = None
+    if src_st is None or not stat.S_ISREG(src_st.st_mode):
         raise FileNotFoundError(f"فایل پیدا نشد: {source}")
+    # همین حالا در Assets است: بدون resolve و بدون کپی
+    if source.parent == PATHS.assets:
+        return source.name
     dest = PATHS.assets / source.name
-    if source.resolve() != dest.resolve():
+    try:
+        dst_st = dest.stat()
+    except OSError:
+        dst_st = None
+    # کپی قبلی همین فایل: copystat همان st_mtime_ns را دقیقاً حفظ می‌کند، پس فقط
+    # تساوی کامل یعنی «همان فایل»؛ فایل هم‌نام و هم‌اندازه با زمان دیگر دوباره کپی می‌شود
+    if dst_st is not None and dst_st.st_size == src_st.st_size and dst_st.st_mtime_ns == src_st.st_mtime_ns:
+        return source.name
+    if dst_st is None or source.resolve() != dest.resolve():
         try:
-            shutil.copy2(str(source), str(dest))
+            shutil.copy2(source, dest)
         except Exception as e:
             raise RuntimeError(f"خطا در کپی به Assets: {source} -> {dest}: {e}")
     return source.name
 
 # ============ پارسرها ============
 
+# نگاشت‌ها یک بار در سطح ماژول ساخته می‌شوند، نه در هر درخواست
+_ASPECT_MAP: Dict[str, Aspect] = {
+    "9:16": Aspect.V9x16,
+    "16:9": Aspect.V16x9,
+    "1:1": Aspect.V1x1,
+}
+_CAPTION_POSITION_MAP: Dict[str, CaptionPosition] = {
+    "Top": CaptionPosition.TOP,
+    "Middle": CaptionPosition.MIDDLE,
+    "Bottom": CaptionPosition.BOTTOM,
+}
+_SHORTS_MODE_MAP: Dict[str, ShortsMode] = {
+    "Off": ShortsMode.OFF,
+    "Auto": ShortsMode.AUTO,
+    "Force": ShortsMode.FORCE,
+}
+
 def _parse_aspect(value: str) -> Aspect:
-    m = {
-        "9:16": Aspect.V9x16,
-        "16:9": Aspect.V16x9,
-        "1:1": Aspect.V1x1,
-    }
-    return m.get(value.strip(), Aspect.V9x16)
+    return _ASPECT_MAP.get(value.strip(), Aspect.V9x16)
 
 def _parse_caption_position(value: str) -> CaptionPosition:
-    m = {
-        "Top": CaptionPosition.TOP,
-        "Middle": CaptionPosition.MIDDLE,
-        "Bottom": CaptionPosition.BOTTOM,
-    }
-    return m.get(value.strip(), CaptionPosition.BOTTOM)
+    return _CAPTION_POSITION_MAP.get(value.strip(), CaptionPosition.BOTTOM)
 
 def _parse_shorts_mode(value: str) -> ShortsMode:
-    m = {
-        "Off": ShortsMode.OFF,
-        "Auto": ShortsMode.AUTO,
-        "Force": ShortsMode.FORCE,
-    }
-    return m.get(value.strip(), ShortsMode.OFF)
+    return _SHORTS_MODE_MAP.get(value.strip(), ShortsMode.OFF)
 
 def _build_config_from_json(data: Dict[str, Any]) -> Tuple[ProjectCfg, List[str]]:
     used_sources: List[str] = []
@@ -159,11 +183,14 @@ def _build_config_from_json(data: Dict[str, Any]) -> Tuple[ProjectCfg, List[str]
     paths = [str(s.get("path", "")).strip() for s in segs if isinstance(s, dict) and s.get("path")]
     audio_basename = ""
     if paths:
-        basenames = []
-        for p in paths:
-            b = _copy_file_to_assets(p)
-            basenames.append(b)
-            used_sources.append(p)
+        # سگمنت‌های بزرگ هم‌زمان کپی می‌شوند (ترتیب خروجی map حفظ می‌شود)؛
+        # نام‌های تکراری یک مقصد دارند، پس آن حالت ترتیبی می‌ماند
+        if len(paths) > 1 and len({Path(p).name for p in paths}) == len(paths):
+            with ThreadPoolExecutor(max_workers=min(4, len(paths)), thread_name_prefix="vr-copy") as pool:
+                basenames = list(pool.map(_copy_file_to_assets, paths))
+        else:
+            basenames = [_copy_file_to_assets(p) for p in paths]
+        used_sources.extend(paths)
         audio_basename = _concatenate_audio_files(basenames)
     # === bg ===
     bg_path = str(data.get("bgPath", "")).strip()
@@ -223,8 +250,15 @@ renderer_queue = RendererQueue(paths=PATHS)
 
 # ============ Flask App ============
 
+# JSON پاسخ‌ها با provider پیش‌فرض Flask (قالب تاریخ HTTP، ensure_ascii/sort_keys) تا wire format API ثابت بماند
 app = Flask(__name__, static_folder="../frontend_dist", static_url_path="/")
 
+# پشت وب‌سرور با پشتیبانی X-Sendfile (Apache mod_xsendfile، lighttpd، ...)
+# send_file فقط header می‌فرستد و خود وب‌سرور فایل را با sendfile(2) سرو می‌کند.
+# بدون آن، send_file از wsgi.file_wrapper سرور (wrap_file) استفاده می‌کند.
+if os.getenv("VR_USE_XSENDFILE", "").strip().lower() in {"1", "true", "yes", "on"}:
+    app.config["USE_X_SENDFILE"] = True
+
 
 def _resolve_allowed_origins() -> List[str]:
     raw = os.getenv("CORS_ALLOW_ORIGIN", "")
@@ -258,6 +292,7 @@ def health_check() -> Any:
     data = {
         "assets": str(PATHS.assets),
         "output_local": str(PATHS.out_local),
+        "paths_cache": _initialize_paths.cache_info()._asdict(),
     }
     return _response_ok(data)
 
@@ -288,20 +323,34 @@ def list_files_api() -> Any:
     if PATHS.base_drive:
         allowed_roots.append(PATHS.base_drive)
 
-    def under_root(p: Path, root: Path) -> bool:
-        resolved_root = root.resolve()
-        resolved_path = p.resolve()
-        return resolved_path == resolved_root or resolved_root in resolved_path.parents
+    # ریشه‌ها یک بار resolve می‌شوند؛ بررسی هر فرزند فقط مقایسه پیشوند رشته است
+    prefixes = []
+    for root in allowed_roots:
+        r = str(root.resolve())
+        prefixes.append((r, r if r.endswith(os.sep) else r + os.sep))
+
+    def allowed(p: str) -> bool:
+        return any(p == r or p.startswith(pre) for r, pre in prefixes)
+
     items = []
-    for ch in sorted(directory.iterdir(), key=lambda x: x.name.lower()):
-        if any(under_root(ch, root) for root in allowed_roots):
-            st = ch.stat()
+    with os.scandir(directory.resolve()) as it:
+        for entry in it:
+            # فقط symlink ها ممکن است بیرون از ریشه اشاره کنند → فقط آن‌ها realpath می‌شوند
+            real = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+            if not allowed(real):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            is_dir = stat.S_ISDIR(st.st_mode)
             items.append({
-                "name": ch.name,
-                "type": "directory" if ch.is_dir() else "file",
-                "size": 0 if ch.is_dir() else st.st_size,
+                "name": entry.name,
+                "type": "directory" if is_dir else "file",
+                "size": 0 if is_dir else st.st_size,
                 "mtime": int(st.st_mtime),
             })
+    items.sort(key=lambda x: x["name"].lower())
     return _response_ok({"items": items})
 
 @app.post("/transcribe")
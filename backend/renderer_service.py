@@ -3,10 +3,12 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import threading
 import time
 import traceback
 import uuid
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -52,21 +54,33 @@ class RendererQueue:
         self,
         paths: Optional[Paths] = None,
         *,
-        max_workers: int = 2,
+        max_workers: Optional[int] = None,
         max_inflight: int = 3,
+        max_jobs: Optional[int] = None,
     ) -> None:
         global _queue_instance
 
+        # Bounded pool: concurrent renders are capped (VR_MAX_RENDERS, default 2)
+        if max_workers is None:
+            max_workers = max(1, int(os.getenv("VR_MAX_RENDERS", "2") or 2))
         self._paths = paths
         self._output_root = ensure_outputs_dir()
         self._output_root.mkdir(parents=True, exist_ok=True)
         self._max_inflight = max_inflight
+        # Finished jobs kept for /status and /download (VR_MAX_JOBS, default 200)
+        if max_jobs is None:
+            max_jobs = max(1, int(os.getenv("VR_MAX_JOBS", "200") or 200))
+        self._max_jobs = max_jobs
         self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="renderer-worker")
-        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Insertion order == submission order, so the oldest job is always first
+        self._jobs: OrderedDict[str, Dict[str, Any]] = OrderedDict()
         self._lock = threading.Lock()
         self._log = logging.getLogger("VideoRobot.renderer_queue")
         _queue_instance = self
-        self._log.info("RendererQueue ready (root=%s, max_inflight=%d)", self._output_root, max_inflight)
+        self._log.info(
+            "RendererQueue ready (root=%s, workers=%d, max_inflight=%d)",
+            self._output_root, max_workers, max_inflight,
+        )
 
     # ------------------------------------------------------------------
     # Public API
@@ -97,14 +111,17 @@ class RendererQueue:
 
         with self._lock:
             self._jobs[job_id] = job
+            self._cleanup_old_jobs()
 
         self._executor.submit(self._process_job, job_id, manifest, job_dir)
         return {"job_id": job_id, "workdir": job_dir.as_posix(), "inputs_sha256": inputs_hash}
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            return dict(job) if job else None
+        # Lock-free: job dicts are immutable snapshots (see _update_job), and a
+        # single dict.get is atomic under the GIL, so /status polls never wait
+        # on the writer.
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
 
     def find_output(self, filename: str) -> Optional[Path]:
         if not filename or Path(filename).name != filename:
@@ -137,13 +154,30 @@ class RendererQueue:
             inflight = sum(1 for job in self._jobs.values() if job.get("state") in {"queued", "running"})
             return inflight < self._max_inflight
 
+    def _cleanup_old_jobs(self) -> None:
+        # Caller holds the lock. FIFO eviction of the oldest finished jobs;
+        # queued/running ones are stepped over (never dropped, never blocking),
+        # and there are at most max_inflight of them, so the walk stays short.
+        excess = len(self._jobs) - self._max_jobs
+        if excess <= 0:
+            return
+        stale = []
+        for job_id, job in self._jobs.items():
+            if job.get("state") not in {"queued", "running"}:
+                stale.append(job_id)
+                if len(stale) == excess:
+                    break
+        for job_id in stale:
+            del self._jobs[job_id]
+
     def _update_job(self, job_id: str, **fields: Any) -> None:
+        # Copy-on-write: publish a new dict instead of mutating the one readers
+        # may hold; the lock only serialises writers.
         with self._lock:
             job = self._jobs.get(job_id)
             if not job:
                 return
-            job.update(fields)
-            job["updated_at"] = time.time()
+            self._jobs[job_id] = {**job, **fields, "updated_at": time.time()}
 
     def _process_job(self, job_id: str, manifest: Dict[str, Any], job_dir: Path) -> None:
         self._update_job(job_id, state="running", pct=10, message="initialising renderer")
@@ -313,6 +347,21 @@ def status_route():
     return _ok(job)
 
 
+def _send_output(path: Path, mtime: Optional[float] = None):
+    # Conditional response: If-None-Match/If-Modified-Since → 304 with no body,
+    # Range → 206 so interrupted MP4 downloads resume instead of restarting.
+    if mtime is None:
+        mtime = path.stat().st_mtime
+    return send_file(
+        path,
+        as_attachment=True,
+        download_name=path.name,
+        conditional=True,
+        etag=True,
+        last_modified=mtime,
+    )
+
+
 @renderer_bp.get("/download")
 def download_route():
     job_id = (request.args.get("jobId") or request.args.get("id") or "").strip()
@@ -327,16 +376,18 @@ def download_route():
         if not mp4:
             return _err("result not available", 404)
         path = Path(mp4)
-        if not path.exists():
+        try:
+            st = path.stat()
+        except OSError:
             return _err("output missing on disk", 404)
-        return send_file(path, as_attachment=True, download_name=path.name)
+        return _send_output(path, st.st_mtime)
 
     filename = request.args.get("file")
     if filename:
         path = _queue().find_output(filename)
         if not path:
             return _err("file not found", 404)
-        return send_file(path, as_attachment=True, download_name=path.name)
+        return _send_output(path)
 
     return _err("jobId or file parameter is required", 400)
 
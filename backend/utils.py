@@ -12,6 +12,7 @@ VideoRobot — Utilities (نسخه تمیز و کامل)
 """
 from __future__ import annotations
 
+import functools
 import importlib
 import logging
 import os
@@ -21,9 +22,10 @@ import subprocess
 import sys
 import unicodedata
 import hashlib
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Sequence, Any, Dict
+from typing import Callable, Optional, Sequence, Any, Dict
 
 # ===========================================================================
 # SECTION 0: Logging setup (اضافه شد تا ImportError حل شود)
@@ -31,35 +33,78 @@ from typing import Optional, Sequence, Any, Dict
 
 LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 
-def setup_logging(level_env: str = "VR_LOG_LEVEL") -> logging.Logger:
+# فقط نام‌های معتبر سطح؛ getattr(logging, ...) هر attribute ماژول را برمی‌گرداند
+_LEVEL_MAP: Dict[str, int] = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+# سطح resolve‌شده برای هر env key؛ فراخوانی‌های بعدی بدون getenv برمی‌گردند
+_LOGGING_CACHE: Dict[str, int] = {}
+
+
+# handlerی که setup_logging روی root نصب کرده؛ در پیکربندی مجدد reuse می‌شود
+_HANDLER: Optional[logging.Handler] = None
+
+
+@functools.lru_cache(maxsize=8)
+def _formatter(fmt: str) -> logging.Formatter:
+    """Formatter اشتراکی برای هر رشته فرمت"""
+    return logging.Formatter(fmt)
+
+
+def setup_logging(level_env: str = "VR_LOG_LEVEL", *, fmt: Optional[str] = None) -> logging.Logger:
     """
     Initialize consistent logging for VideoRobot.
     Reads level from env (default INFO) and returns the package logger.
 
     Safe to call multiple times in notebooks; handlers تکثیر نمی‌شوند.
+    The env var is read once per ``level_env``; later calls are O(1) and
+    do not pick up changes made to the environment mid-run.
+
+    Passing ``fmt`` re-formats the handler installed by a previous call in
+    place (no new handler is created). Handlers that someone else put on
+    root (Colab, a host app) are left alone: ``fmt`` is then skipped and a
+    debug message says so.
     """
+    global _HANDLER
+
+    logger = logging.getLogger("VideoRobot")
+    if fmt is not None:
+        if _HANDLER is not None:
+            _HANDLER.setFormatter(_formatter(fmt))
+        elif logging.getLogger().handlers:
+            logger.debug("setup_logging: fmt skipped, root handlers were not installed here")
+    if level_env in _LOGGING_CACHE:
+        return logger
+
     level = os.getenv(level_env, "INFO").upper()
-    lvl = getattr(logging, level, logging.INFO)
+    lvl = _LEVEL_MAP.get(level, logging.INFO)
 
     root = logging.getLogger()
     # از تکثیر handlerها در Colab جلوگیری کنیم
     if not root.handlers:
-        logging.basicConfig(level=lvl, format=LOG_FORMAT)
-    else:
-        root.setLevel(lvl)
+        _HANDLER = logging.StreamHandler()
+        _HANDLER.setFormatter(_formatter(fmt or LOG_FORMAT))
+        root.addHandler(_HANDLER)
+    root.setLevel(lvl)
 
-    logger = logging.getLogger("VideoRobot")
     logger.setLevel(lvl)
+    _LOGGING_CACHE[level_env] = lvl
     return logger
 
-# ماژول را با یک logger پایدار بالا می‌آوریم
-setup_logging()
+# بدون side effect در import: handlerها فقط با فراخوانی صریح setup_logging نصب می‌شوند
 log = logging.getLogger("VideoRobot.utils")
 
 __all__ = [
     "setup_logging",
     "ShResult",
     "sh",
+    "sh_stream",
     "ensure_pkg_safe",
     "mount_drive_once",
     "resolve_drive_base",
@@ -169,6 +214,83 @@ def sh(
     return result
 
 
+def sh_stream(
+    cmd: Sequence[str],
+    desc: Optional[str] = None,
+    *,
+    check: bool = True,
+    tail_kb: int = 64,
+    cwd: Optional[Path] = None,
+    env: Optional[dict[str, str]] = None,
+    stderr_consumer: Optional[Callable[[bytes], None]] = None,
+) -> ShResult:
+    """
+    مثل sh، اما stdout دور ریخته می‌شود و فقط انتهای stderr نگه داشته می‌شود
+
+    برای ffmpeg های طولانی (مثلاً پاس اندازه‌گیری loudnorm با ``-f null``)
+    که فقط چند خط آخر stderr برایشان مهم است؛ حافظه به tail_kb محدود می‌ماند.
+
+    Args:
+        cmd: دستور به صورت لیست
+        desc: توضیح برای لاگ
+        check: اگر True باشد، خطا در صورت شکست
+        tail_kb: حداکثر حجم نگه‌داشته‌شده از انتهای stderr (کیلوبایت)
+        cwd: مسیر اجرا
+        env: متغیرهای محیطی
+        stderr_consumer: اختیاری؛ هر خط stderr (bytes) همان لحظه به آن داده می‌شود
+            تا parse هم‌زمان با اجرای ffmpeg انجام شود (مثلاً JSON پاس loudnorm)
+
+    Returns:
+        ShResult با stdout خالی و انتهای stderr
+    """
+    if not cmd:
+        raise ValueError("دستور خالی است")
+
+    str_cmd = _to_str_seq(cmd)
+
+    if desc:
+        log.info("→ %s", desc)
+
+    limit = max(1, int(tail_kb)) * 1024
+    tail: deque[bytes] = deque()
+    size = 0
+
+    with subprocess.Popen(
+        str_cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        cwd=str(cwd) if cwd else None,
+        env=env if env is not None else os.environ.copy(),
+    ) as proc:
+        if proc.stderr is None:  # stderr=PIPE always sets it; narrows the type
+            raise RuntimeError("stderr pipe برای دستور باز نشد")
+        for line in proc.stderr:
+            if stderr_consumer is not None:
+                stderr_consumer(line)
+            tail.append(line)
+            size += len(line)
+            while size > limit and len(tail) > 1:
+                size -= len(tail.popleft())
+        returncode = proc.wait()
+
+    result = ShResult(
+        cmd=str_cmd,
+        returncode=returncode,
+        stdout="",
+        stderr=b"".join(tail).decode("utf-8", "replace"),
+    )
+
+    if returncode != 0 and check:
+        msg = (
+            f"دستور با خطا مواجه شد (code: {returncode})\n"
+            f"Command: {' '.join(str_cmd)}\n"
+            f"STDERR: {result.stderr.strip()}"
+        )
+        raise RuntimeError(msg)
+
+    return result
+
+
 # ===========================================================================
 # SECTION 2: مدیریت پکیج‌ها
 # ===========================================================================
@@ -0,0 +1,106 @@
+"""Unit tests for the stderr parsers and the pass-1 cache key in backend.audio_processor."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from backend.audio_processor import (
+    _extract_ebur128_summary,
+    _extract_last_json,
+    _gain_filter,
+    _json_object_spans,
+    _probe_cache_key,
+    _split_by_filter,
+)
+
+LOUDNORM_TAIL = (
+    "[Parsed_loudnorm_2 @ 0x55d0c0] \n"
+    "{\n"
+    '\t"input_i" : "-23.51",\n'
+    '\t"input_tp" : "-4.10",\n'
+    '\t"input_lra" : "6.20",\n'
+    '\t"input_thresh" : "-33.87",\n'
+    '\t"target_offset" : "0.12"\n'
+    "}\n"
+)
+
+
+def test_json_spans_match_nested_pairs_and_skip_strays() -> None:
+    text = '} {"a": {"b": "}"}} {'
+    assert _json_object_spans(text) == [(8, 17), (2, 18)]
+
+
+def test_extract_last_json_loudnorm_tail() -> None:
+    stats = _extract_last_json("size=N/A time=00:01:00.00\n" + LOUDNORM_TAIL)
+    assert stats["input_i"] == "-23.51"
+    assert stats["target_offset"] == "0.12"
+
+
+def test_extract_last_json_ignores_noise_around_block() -> None:
+    noisy = "Input #0, wav, from 'it\"s {odd.wav':\n{junk\n" + LOUDNORM_TAIL + "late } stray { line }\n"
+    assert _extract_last_json(noisy)["input_tp"] == "-4.10"
+
+
+def test_extract_last_json_returns_outermost_of_nested() -> None:
+    assert _extract_last_json('{"outer": {"inner": 1}}') == {"outer": {"inner": 1}}
+
+
+@pytest.mark.parametrize("text", ["", "no braces at all", LOUDNORM_TAIL[:-20], "}" * 1000 + "{" * 1000])
+def test_extract_last_json_truncated_or_missing(text: str) -> None:
+    assert _extract_last_json(text) == {}
+
+
+def test_split_by_filter_groups_by_instance() -> None:
+    text = (
+        "[Parsed_ebur128_0 @ 0x1] a\n"
+        "[Parsed_ebur128_1 @ 0x2] b\n"
+        "[Parsed_ebur128_0 @ 0x1] c\n"
+        "[Parsed_volume_3 @ 0x3] d\n"
+    )
+    segments = _split_by_filter(text, "ebur128")
+    assert sorted(segments) == [0, 1]
+    assert "a" in segments[0] and "c" in segments[0]
+    assert segments[1].strip().startswith("b")
+
+
+def test_extract_ebur128_summary_in_graph_order() -> None:
+    def summary(n: int, i: str, tp: str) -> str:
+        return (
+            f"[Parsed_ebur128_{n} @ 0x{n}] Summary:\n\n"
+            f"  Integrated loudness:\n    I:         {i} LUFS\n    Threshold: -30.0 LUFS\n\n"
+            f"  True peak:\n    Peak:       {tp} dBFS\n"
+        )
+
+    text = summary(4, "-18.0", "-1.5") + summary(1, "-20.5", "-3.0") + "[Parsed_ebur128_7 @ 0x7] no summary\n"
+    assert _extract_ebur128_summary(text) == [
+        {"input_i": -20.5, "input_tp": -3.0},
+        {"input_i": -18.0, "input_tp": -1.5},
+        {},
+    ]
+
+
+def test_gain_filter_rejects_unclamped_gains() -> None:
+    assert _gain_filter(0.0, 0.0) == ""
+    assert _gain_filter(-6.0, 0.0).startswith("pan=stereo|FL=0.501187*c0")
+    with pytest.raises(ValueError):
+        _gain_filter(30.0, 0.0)
+    with pytest.raises(ValueError):
+        _gain_filter(float("nan"), 0.0)
+
+
+def test_probe_cache_key_changes_with_mtime_and_size(tmp_path: Path) -> None:
+    source = tmp_path / "a.wav"
+    source.write_bytes(b"x" * 4096)
+    key = _probe_cache_key(source, "loudnorm")
+    assert _probe_cache_key(source, "loudnorm") == key
+    assert _probe_cache_key(source, "pan,loudnorm") != key
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    touched = _probe_cache_key(source, "loudnorm")
+    assert touched != key
+
+    source.write_bytes(b"x" * 4097)
+    assert _probe_cache_key(source, "loudnorm") not in {key, touched}
@@ -0,0 +1,84 @@
+"""Unit tests for backend.config: positional builder and the YAML sidecar cache."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from backend.config import AudioCfg, ProjectCfg, _build, _cfg_cache_path, _read_cfg_cache, _write_cfg_cache
+
+CFG = {
+    "audio": {"filename": "a.wav"},
+    "captions": {
+        "font_choice": None, "font_name": None, "font_size": 40,
+        "active_color": "FFFF00", "keyword_color": "#FFFFFF", "border_thickness": 2,
+        "max_words_per_line": 5, "max_words_per_caption": 10, "position": "bottom", "margin_v": 10,
+    },
+    "figures": {"use": False, "duration_s": 1.0},
+    "intro_outro": {"intro_mp4": None, "intro_key": False, "outro_mp4": None, "outro_key": False},
+    "cta": {
+        "loop_mp4": None, "start_s": 0, "repeat_s": 1, "key_color": "00FF00",
+        "similarity": 0.2, "blend": 0.1, "position": "center",
+    },
+    "bgm": {
+        "name": None, "gain_db": -20, "auto_duck": True, "duck_threshold": -30,
+        "duck_ratio": 10, "duck_attack": 20, "duck_release": 300,
+    },
+    "broll": {"use": False, "first_at": 5, "every_s": 10, "duration_s": 3},
+    "visual": {"bg_image": "bg.png", "aspect": "9:16"},
+    "shorts": {"mode": "auto"},
+}
+
+
+def test_build_fills_defaults_positionally() -> None:
+    cfg = _build(AudioCfg, {"target_lufs": -14.0, "filename": "a.wav"})
+    assert cfg == AudioCfg(filename="a.wav", target_lufs=-14.0)
+
+
+def test_build_rejects_unknown_key() -> None:
+    with pytest.raises(TypeError, match="target_lufz"):
+        _build(AudioCfg, {"filename": "a.wav", "target_lufz": -14.0})
+
+
+def test_build_rejects_missing_required_field() -> None:
+    with pytest.raises(TypeError, match="filename"):
+        _build(AudioCfg, {})
+
+
+def test_cfg_cache_invalidated_by_mtime_and_size(tmp_path: Path) -> None:
+    source = tmp_path / "cfg.yaml"
+    source.write_text("a: 1\n", encoding="utf-8")
+    _write_cfg_cache(source, {"a": 1})
+    assert _cfg_cache_path(source).exists()
+    assert _read_cfg_cache(source) == {"a": 1}
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert _read_cfg_cache(source) is None
+
+    _write_cfg_cache(source, {"a": 1})
+    source.write_text("a: 12\n", encoding="utf-8")
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert _read_cfg_cache(source) is None
+
+
+def test_cfg_cache_ignores_broken_file(tmp_path: Path) -> None:
+    source = tmp_path / "cfg.yaml"
+    source.write_text("a: 1\n", encoding="utf-8")
+    _cfg_cache_path(source).write_text("{not json", encoding="utf-8")
+    assert _read_cfg_cache(source) is None
+
+
+def test_cached_reload_matches_first_load(tmp_path: Path) -> None:
+    yaml = pytest.importorskip("yaml")
+    source = tmp_path / "project.yaml"
+    source.write_text(yaml.safe_dump(CFG), encoding="utf-8")
+
+    first = ProjectCfg.load_from_file(source)
+    assert _cfg_cache_path(source).exists()
+    second = ProjectCfg.load_from_file(source)
+
+    assert second == first
+    assert second.to_dict() == first.to_dict()
+    assert second.captions.active_color == "#FFFF00"
@@ -0,0 +1,39 @@
+"""Unit tests for RendererQueue job-table eviction."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import pytest
+
+for _dep in ("flask", "jsonschema", "moviepy"):
+    pytest.importorskip(_dep)
+
+from backend.renderer_service import RendererQueue  # noqa: E402
+
+
+def _queue(states: list[str], max_jobs: int) -> RendererQueue:
+    # Bypass __init__: no executor or output directory is needed for the table
+    queue = RendererQueue.__new__(RendererQueue)
+    queue._lock = threading.Lock()
+    queue._max_jobs = max_jobs
+    queue._jobs = OrderedDict((f"j{i}", {"job_id": f"j{i}", "state": s}) for i, s in enumerate(states))
+    return queue
+
+
+def test_evicts_oldest_finished_jobs_first() -> None:
+    queue = _queue(["success", "error", "success", "success"], max_jobs=2)
+    queue._cleanup_old_jobs()
+    assert list(queue._jobs) == ["j2", "j3"]
+
+
+def test_active_job_at_front_does_not_block_eviction() -> None:
+    queue = _queue(["running", "success", "success", "queued", "success"], max_jobs=3)
+    queue._cleanup_old_jobs()
+    assert list(queue._jobs) == ["j0", "j3", "j4"]
+
+
+def test_active_jobs_are_never_evicted() -> None:
+    queue = _queue(["running", "queued", "running"], max_jobs=1)
+    queue._cleanup_old_jobs()
+    assert list(queue._jobs) == ["j0", "j1", "j2"]